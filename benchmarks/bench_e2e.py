@@ -0,0 +1,307 @@
+# End-to-end benchmark for poo7er's command paths.
+#
+# Starts local stand-ins for the Twitch OAuth endpoint, /helix/games,
+# /helix/clips, the clip pages (which set video.src after a delay, like the
+# real player) and the clip CDN (which serves mp4 bytes at a capped rate), then
+# runs poo7er's own command functions against them with a real browser. Each
+# command mode and worker count runs in a fresh subprocess, so peak RSS is
+# measured per scenario. Reports clips/min, video URL resolve times, MB/s and
+# peak RSS.
+#
+#   python benchmarks/bench_e2e.py --limit 10 --workers 1 4 --json e2e.json
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+MODES = ['list', 'download', 'test', 'title']
+RATE_LIMIT_POINTS = 800  # Helix app-token bucket, refilled every minute
+CDN_WRITE_SIZE = 64 * 1024
+
+CLIP_PAGE_HTML = """<!doctype html>
+<html><body>
+<video muted playsinline></video>
+<script>
+setTimeout(() => {{ document.querySelector('video').src = '/cdn/{slug}/video.mp4'; }}, {delay_ms});
+</script>
+</body></html>"""
+
+def make_clips(base_url, game_names, clips_per_game):
+    clips = {}
+    now = time.time()
+    for game_index, game_name in enumerate(game_names):
+        game_id = str(1000 + game_index)
+        clips[game_id] = [{
+            'id': f'Bench{game_id}Clip{clip_index}',
+            'url': f'{base_url}/clip/Bench{game_id}Clip{clip_index}',
+            'embed_url': '',
+            'broadcaster_id': '1',
+            'broadcaster_name': 'bench_streamer',
+            'creator_id': '2',
+            'creator_name': 'bench_clipper',
+            'video_id': '',
+            'game_id': game_id,
+            'language': 'en',
+            'title': f'{game_name} bench clip {clip_index}',
+            'view_count': clips_per_game - clip_index,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now - clip_index * 60)),
+            'thumbnail_url': '',
+            'duration': 30.0,
+        } for clip_index in range(clips_per_game)]
+    return clips
+
+# One aiohttp app standing in for id.twitch.tv, api.twitch.tv, the clip pages
+# and the clip CDN. Counters are kept in app['stats'].
+async def start_stand_ins(game_names, clips_per_game, clip_bytes, page_delay, cdn_mbps):
+    payload = os.urandom(clip_bytes)
+    bucket = {'remaining': RATE_LIMIT_POINTS, 'reset': time.time() + 60}
+    stats = {'token': 0, 'games': 0, 'clips': 0, 'pages': 0, 'cdn': 0, 'rate_limited': 0}
+    game_ids = {name: str(1000 + index) for index, name in enumerate(game_names)}
+    clips = {}
+
+    def rate_limit_headers():
+        return {
+            'Ratelimit-Limit': str(RATE_LIMIT_POINTS),
+            'Ratelimit-Remaining': str(bucket['remaining']),
+            'Ratelimit-Reset': str(int(bucket['reset'])),
+        }
+
+    def take_point():
+        if time.time() >= bucket['reset']:
+            bucket['remaining'], bucket['reset'] = RATE_LIMIT_POINTS, time.time() + 60
+        if bucket['remaining'] <= 0:
+            stats['rate_limited'] += 1
+            return False
+        bucket['remaining'] -= 1
+        return True
+
+    async def token(request):
+        stats['token'] += 1
+        return web.json_response({'access_token': 'bench-token', 'expires_in': 5000000, 'token_type': 'bearer'})
+
+    async def games(request):
+        stats['games'] += 1
+        if not take_point():
+            return web.json_response({'error': 'Too Many Requests'}, status=429, headers=rate_limit_headers())
+        names = request.query.getall('name', [])
+        data = [{'id': game_ids[name], 'name': name} for name in names if name in game_ids]
+        return web.json_response({'data': data}, headers=rate_limit_headers())
+
+    async def helix_clips(request):
+        stats['clips'] += 1
+        if not take_point():
+            return web.json_response({'error': 'Too Many Requests'}, status=429, headers=rate_limit_headers())
+        game_clips = clips.get(request.query.get('game_id'), [])
+        first = int(request.query.get('first', 20))
+        after = int(request.query.get('after') or 0)
+        pagination = {'cursor': str(after + first)} if after + first < len(game_clips) else {}
+        return web.json_response({'data': game_clips[after:after + first], 'pagination': pagination},
+                                 headers=rate_limit_headers())
+
+    async def clip_page(request):
+        stats['pages'] += 1
+        html = CLIP_PAGE_HTML.format(slug=request.match_info['slug'], delay_ms=int(page_delay * 1000))
+        return web.Response(text=html, content_type='text/html')
+
+    # Serves the shared payload, honouring `Range: bytes=N-` and pacing writes
+    # to cdn_mbps per connection (0 means unthrottled)
+    async def cdn(request):
+        stats['cdn'] += 1
+        offset = 0
+        range_header = request.headers.get('Range', '')
+        if range_header.startswith('bytes='):
+            offset = int(range_header[len('bytes='):].split('-', 1)[0] or 0)
+            if offset >= len(payload):
+                return web.Response(status=416, headers={'Content-Range': f'bytes */{len(payload)}'})
+
+        response = web.StreamResponse(status=206 if offset else 200)
+        response.content_type = 'video/mp4'
+        response.content_length = len(payload) - offset
+        if offset:
+            response.headers['Content-Range'] = f'bytes {offset}-{len(payload) - 1}/{len(payload)}'
+        await response.prepare(request)
+        start = time.perf_counter()
+        sent = 0
+        for position in range(offset, len(payload), CDN_WRITE_SIZE):
+            chunk = payload[position:position + CDN_WRITE_SIZE]
+            await response.write(chunk)
+            sent += len(chunk)
+            if cdn_mbps:
+                ahead = sent / (cdn_mbps * 1024 * 1024) - (time.perf_counter() - start)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post('/oauth2/token', token)
+    app.router.add_get('/helix/games', games)
+    app.router.add_get('/helix/clips', helix_clips)
+    app.router.add_get('/clip/{slug}', clip_page)
+    app.router.add_get('/cdn/{slug}/video.mp4', cdn)
+    app['stats'] = stats
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    base_url = f'http://127.0.0.1:{runner.addresses[0][1]}'
+    clips.update(make_clips(base_url, game_names, clips_per_game))
+    return runner, base_url
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+# Runs a single scenario inside the child process, through the same objects
+# main() builds, and returns its measurements
+async def run_scenario(mode, workers, base_url, limit, game_names, block_resources):
+    import poo7er
+
+    poo7er.HelixClient.TOKEN_URL = f'{base_url}/oauth2/token'
+    poo7er.HelixClient.HELIX_URL = f'{base_url}/helix'
+    poo7er.games_list = game_names
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    browser = poo7er.BrowserSession(headless=True, show_network_info=False, block_resources=block_resources)
+    async with poo7er.HelixClient('bench-client', 'bench-secret') as helix, browser:
+        with poo7er.ClipManifest() as manifest:
+            if mode == 'list':
+                await poo7er.list_clips(limit, helix, manifest)
+            elif mode == 'download':
+                await poo7er.download_latest_clips(limit, helix, manifest, browser, workers=workers)
+            elif mode == 'test':
+                await poo7er.test_download_one_clip(limit, helix, manifest, browser, game_names[0])
+            elif mode == 'title':
+                # Last clip of the last game, so the search has to page before matching
+                await poo7er.download_clip_by_title(f'{game_names[-1]} bench clip {limit - 1}', helix, manifest, browser)
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+            listed = manifest.db.execute("SELECT COUNT(*) FROM clips").fetchone()[0]
+            rows = manifest.db.execute(
+                "SELECT byte_size, resolve_seconds, download_seconds FROM clips WHERE status = 'downloaded'"
+            ).fetchall()
+            failed = manifest.db.execute("SELECT COUNT(*) FROM clips WHERE status = 'failed'").fetchone()[0]
+
+    resolve_times = [row['resolve_seconds'] for row in rows if row['resolve_seconds'] is not None]
+    total_bytes = sum(row['byte_size'] or 0 for row in rows)
+    # ru_maxrss is in KiB on Linux; the browser is counted once it has exited
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return {
+        'mode': mode,
+        'workers': workers,
+        'wall_s': wall,
+        'cpu_s': cpu,
+        'clips_listed': listed,
+        'clips_downloaded': len(rows),
+        'clips_failed': failed,
+        'clips_per_min': len(rows) / wall * 60 if wall else 0,
+        'resolve_s': {
+            'mean': statistics.fmean(resolve_times) if resolve_times else None,
+            'p50': percentile(resolve_times, 0.5),
+            'p95': percentile(resolve_times, 0.95),
+            'max': max(resolve_times, default=None),
+        },
+        'mb_downloaded': total_bytes / (1024 * 1024),
+        'mb_per_s': total_bytes / (1024 * 1024) / wall if wall else 0,
+        'peak_rss_mb': self_rss,
+        'peak_child_rss_mb': child_rss,
+    }
+
+# Child entry point: one scenario per process so RSS peaks don't carry over
+def scenario_main(args):
+    mode, workers = args.scenario.split(':')
+    result = asyncio.run(run_scenario(mode, int(workers), args.base_url, args.limit, args.game_names, not args.no_block))
+    with open(args.result, 'w') as f:
+        json.dump(result, f)
+
+async def run_scenarios(args, scenarios):
+    runner, base_url = await start_stand_ins(args.game_names, args.limit, int(args.clip_mb * 1024 * 1024),
+                                             args.page_delay, args.cdn_mbps)
+    results = []
+    try:
+        for mode, workers in scenarios:
+            with tempfile.TemporaryDirectory() as tmp:
+                result_path = os.path.join(tmp, 'result.json')
+                command = [
+                    sys.executable, os.path.abspath(__file__),
+                    '--scenario', f'{mode}:{workers}', '--base-url', base_url, '--result', result_path,
+                    '--limit', str(args.limit), '--games', *args.game_names,
+                ]
+                if args.no_block:
+                    command.append('--no-block')
+                # Fresh cache dir and cwd so every scenario starts cold and downloads land in tmp
+                env = dict(os.environ, POO7ER_CACHE_DIR=os.path.join(tmp, 'cache'))
+                process = await asyncio.create_subprocess_exec(
+                    *command, cwd=tmp, env=env,
+                    stdout=None if args.verbose else subprocess.DEVNULL,
+                    stderr=None if args.verbose else subprocess.DEVNULL,
+                )
+                returncode = await process.wait()
+                if returncode != 0 or not os.path.exists(result_path):
+                    print(f"{mode:<9} w={workers:<3} failed (exit {returncode}); rerun with --verbose for output")
+                    results.append({'mode': mode, 'workers': workers, 'error': f'exit {returncode}'})
+                    continue
+                with open(result_path) as f:
+                    result = json.load(f)
+                results.append(result)
+                print_result(result)
+    finally:
+        stats = dict(runner.app['stats'])
+        await runner.cleanup()
+    return results, stats
+
+def print_result(result):
+    resolve = result['resolve_s']
+    resolve_text = (f"resolve p50 {resolve['p50']:.2f}s p95 {resolve['p95']:.2f}s"
+                    if resolve['p50'] is not None else "resolve -")
+    print(f"{result['mode']:<9} w={result['workers']:<3} {result['wall_s']:7.2f}s  "
+          f"{result['clips_downloaded']:4d}/{result['clips_listed']:<4d} clips  {result['clips_per_min']:7.1f} clips/min  "
+          f"{resolve_text}  {result['mb_per_s']:7.1f} MB/s  "
+          f"RSS {result['peak_rss_mb']:.0f} MB (+{result['peak_child_rss_mb']:.0f} MB children)")
+
+def main():
+    import poo7er
+
+    parser = argparse.ArgumentParser(description="End-to-end benchmark of poo7er against local Twitch stand-ins")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES, help='Command modes to run')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4], help='Worker counts for the download mode')
+    parser.add_argument('--limit', type=int, default=10, help='Clips per game (served by the stand-in and requested)')
+    parser.add_argument('--games', dest='game_names', nargs='+', default=poo7er.games_list, help='Game names to serve')
+    parser.add_argument('--clip-mb', type=float, default=4, help='Size of each clip in MB')
+    parser.add_argument('--page-delay', type=float, default=0.5, help='Seconds before the clip page sets video.src')
+    parser.add_argument('--cdn-mbps', type=float, default=20, help='Per-connection CDN rate in MB/s (0 = unthrottled)')
+    parser.add_argument('-nb', '--no-block', action='store_true', help='Do not block resources on clip pages')
+    parser.add_argument('--verbose', action='store_true', help="Show poo7er's own output")
+    parser.add_argument('--json', help='Write results to this JSON file')
+    # Internal: run a single scenario in this process
+    parser.add_argument('--scenario', help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        scenario_main(args)
+        return
+
+    scenarios = [(mode, workers) for mode in args.modes for workers in (args.workers if mode == 'download' else [1])]
+    results, stats = asyncio.run(run_scenarios(args, scenarios))
+    if args.json:
+        config = {key: getattr(args, key) for key in ('limit', 'game_names', 'clip_mb', 'page_delay', 'cdn_mbps', 'no_block')}
+        with open(args.json, 'w') as f:
+            json.dump({'config': config, 'server_requests': stats, 'results': results}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
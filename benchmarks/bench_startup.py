@@ -0,0 +1,91 @@
+# Startup-time budget for poo7er.
+#
+# Imports poo7er under `python -X importtime` and runs the commands that should
+# feel instant (welcome screen, -gs, -h), reporting the best of several runs.
+# Fails if the import exceeds the budget or pulls in a module that only clip
+# listing or downloading needs.
+#
+#   python benchmarks/bench_startup.py --runs 5 --budget-ms 250
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+POO7ER = os.path.join(ROOT, 'poo7er.py')
+
+# Commands timed end to end, as passed to poo7er.py
+COMMANDS = {'welcome': [], 'games-supported': ['-gs'], 'help': ['-h']}
+
+# Top-level modules that must not be loaded just by importing poo7er
+DEFERRED_MODULES = ['aiohttp', 'aiohttp_socks', 'playwright', 'multiprocessing', 'ctypes', 'zoneinfo', 'rich.progress', 'rich.live', 'rich.table']
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+# Return poo7er's cumulative import time in microseconds and every module imported
+def import_profile():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import poo7er'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative, modules = None, set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        if match.group(4) == 'poo7er' and not match.group(3):
+            cumulative = int(match.group(2))
+    return cumulative, modules
+
+def time_command(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, POO7ER, *args], cwd=ROOT, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+# Bare interpreter start, the floor under every command
+def time_python():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], capture_output=True, check=True)
+    return time.perf_counter() - start
+
+def run(runs):
+    samples = [import_profile() for _ in range(runs)]
+    modules = set().union(*(found for _, found in samples))
+    return {
+        'import_ms': min(cumulative for cumulative, _ in samples) / 1000,
+        'deferred_loaded': sorted(name for name in DEFERRED_MODULES if name in modules),
+        'interpreter_ms': min(time_python() for _ in range(runs)) * 1000,
+        'commands_ms': {name: min(time_command(args) for _ in range(runs)) * 1000 for name, args in COMMANDS.items()},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Check poo7er's startup time against a budget")
+    parser.add_argument('--runs', type=int, default=5, help='Runs per measurement (best is reported)')
+    parser.add_argument('--budget-ms', type=float, default=250, help='Max cumulative `import poo7er` time under -X importtime')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    results = run(args.runs)
+    print(f"{'import poo7er':<16} {results['import_ms']:8.1f} ms  (budget {args.budget_ms:.0f} ms)")
+    print(f"{'python -c pass':<16} {results['interpreter_ms']:8.1f} ms")
+    for name, elapsed in results['commands_ms'].items():
+        print(f"{name:<16} {elapsed:8.1f} ms")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'runs': args.runs, 'budget_ms': args.budget_ms, 'results': results}, f, indent=2)
+
+    failures = []
+    if results['import_ms'] > args.budget_ms:
+        failures.append(f"import took {results['import_ms']:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    if results['deferred_loaded']:
+        failures.append(f"import loaded {', '.join(results['deferred_loaded'])}")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -1,28 +1,35 @@
 import argparse
+import contextlib
+import difflib
+import functools
+import hashlib
+import itertools
+import json
 import os
+import sqlite3
+import struct
+import unicodedata
 import random
 import time
 import platform
-from zoneinfo import available_timezones
-from zoneinfo import ZoneInfo
-from datetime import datetime, timedelta
-from rich.console import Console
-from rich.table import Table
-from rich.progress import Progress, BarColumn, TextColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
-from rich.syntax import Syntax
-from rich.tree import Tree
-from rich.columns import Columns
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlparse
+from typing import TYPE_CHECKING
+from rich.console import Console, Group
 from rich.text import Text
-from playwright.async_api import async_playwright, BrowserContext
 import signal
 import sys
 import asyncio
-import aiohttp
-from aiohttp_socks import ProxyConnector
-import aiofiles
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Heavy dependencies (aiohttp, playwright, the rest of rich, process pools) are
+# imported inside the functions that use them, so that the welcome screen and
+# -gs start without loading them. See benchmarks/bench_startup.py.
+if TYPE_CHECKING:
+    import aiohttp
+    from playwright.async_api import BrowserContext
+
+# Load environment variables from .env file, before any POO7ER_* setting is read
 load_dotenv()
 
 # Initialize Rich console
@@ -62,104 +69,743 @@ MOBILE_VIEWPORTS = [
     {"width": 412, "height": 915},  # Pixel 5
 ]
 
-# Increase the default timeout and add retry logic
-DEFAULT_TIMEOUT = 0000  # 120 seconds
+# Local cache for data that rarely changes between runs
+CACHE_DIR = os.getenv('POO7ER_CACHE_DIR', '.poo7er')
+GAME_ID_CACHE_FILE = os.path.join(CACHE_DIR, 'game_ids.json')
+GAME_ID_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days
+TOKEN_CACHE_FILE = os.path.join(CACHE_DIR, 'token.json')
+MANIFEST_FILE = os.path.join(CACHE_DIR, 'manifest.db')
+STORE_DIR = os.getenv('POO7ER_STORE_DIR', os.path.join(CACHE_DIR, 'store'))
+# Clip leases for --shards; must be on a filesystem every worker can see
+LEASE_DIR = os.getenv('POO7ER_LEASE_DIR', os.path.join(STORE_DIR, 'leases'))
+LEASE_TTL = 60 * 60  # seconds before an abandoned lease can be taken over
+TOKEN_REFRESH_MARGIN = 10 * 60  # Refresh app tokens 10 minutes before they expire
+HELIX_MAX_GAME_NAMES = 100  # Max `name` params per /helix/games request
+HELIX_MAX_PAGE_SIZE = 100  # Max `first` per /helix/clips request
+HELIX_MAX_ATTEMPTS = 3
+HELIX_RATE_LIMIT_RESERVE = 1  # Points left unused in each rate-limit window
+
+# Default clip window and how far -dt searches within it
+DEFAULT_CLIP_WINDOW = timedelta(weeks=4)
+TITLE_SEARCH_LIMIT = 1000  # Max clips listed per game and uncovered window by -dt
+TITLE_CANDIDATES = 200  # Trigram candidates re-ranked per title search
+
+# Download write path: socket read size, how much to buffer before each disk
+# write, and how often progress bars are updated
+DOWNLOAD_CHUNK_SIZE = int(os.getenv('POO7ER_CHUNK_SIZE', 256 * 1024))
+WRITE_BUFFER_SIZE = int(os.getenv('POO7ER_WRITE_BUFFER_SIZE', 4 * 1024 * 1024))
+DOWNLOAD_CONNECTIONS_PER_HOST = int(os.getenv('POO7ER_CONNECTIONS_PER_HOST', 8))
+MAX_BANDWIDTH = float(os.getenv('POO7ER_MAX_BANDWIDTH', 0))  # MB/s per process, 0 = unlimited
+PROGRESS_REFRESH_INTERVAL = 0.25  # seconds
+DASHBOARD_REFRESH_PER_SECOND = 4
+DASHBOARD_PLAIN_INTERVAL = 10  # seconds between status lines when not on a TTY
+VERIFY_WORKERS = max(1, min(4, os.cpu_count() or 1))  # processes for --verify
+
+# Deadline for a clip page to expose its video URL, and how often to simulate
+# user interaction while waiting
+VIDEO_URL_TIMEOUT = float(os.getenv('POO7ER_VIDEO_URL_TIMEOUT', 30))  # seconds
+VIDEO_INTERACTION_INTERVAL = 3  # seconds
+
+# Signed media URLs are reused across retries until shortly before they expire
+SIGNED_URL_EXPIRY_MARGIN = 60  # seconds
+SIGNED_URL_DEFAULT_TTL = 5 * 60  # seconds, for URLs without a readable expiry
+
+# Watch mode: default seconds between polls of each game, per-game overrides
+# (e.g. {'Dota 2': 120}), and how far each poll reaches back before the
+# high-water mark to catch clips Helix indexes late
+WATCH_INTERVAL = 300
+WATCH_INTERVALS = {}
+WATCH_OVERLAP = timedelta(minutes=10)
+
+# Per-phase timing spans (see PhaseMetrics)
+METRICS_FILE = os.getenv('POO7ER_METRICS_FILE')  # JSON lines, appended to
+
+# Optional long-lived browser daemon (see --browser-daemon). The browser is
+# relaunched after serving BROWSER_RECYCLE_PAGES pages to bound memory growth.
+BROWSER_DAEMON_PORT = 8790
+BROWSER_DAEMON_URL = os.getenv('POO7ER_BROWSER_DAEMON_URL')
+BROWSER_DAEMON_MAX_PAGES = 4
+BROWSER_RECYCLE_PAGES = 200
+
+# Requests aborted on clip pages while extracting the video URL. Only the
+# document and its scripts are needed; the media request itself is observed
+# (see get_video_url) and then aborted so the stream isn't downloaded twice.
+BLOCKED_RESOURCE_TYPES = set(filter(None, os.getenv(
+    'POO7ER_BLOCK_RESOURCE_TYPES', 'image,media,font,stylesheet,texttrack,manifest'
+).split(',')))
+BLOCKED_URL_PATTERNS = list(filter(None, os.getenv(
+    'POO7ER_BLOCK_URL_PATTERNS',
+    'spade.twitch.tv,countess.twitch.tv,doubleclick.net,amazon-adsystem.com,google-analytics.com,googletagmanager.com,scorecardresearch.com,sentry.io'
+).split(',')))
+
+# Attempts per clip before it is marked failed
 MAX_RETRIES = 3
 
-# Load user agents and proxies
+# Load user agents and proxies, once and only when a browser needs them
 def load_from_file(file_path):
     if os.path.exists(file_path):
         with open(file_path, 'r') as f:
             return [line.strip() for line in f if line.strip()]
     return []
 
-USER_AGENTS = load_from_file(USER_AGENTS_FILE)
-PROXIES = load_from_file(PROXY_FILE)
+@functools.cache
+def load_user_agents():
+    return load_from_file(USER_AGENTS_FILE)
+
+@functools.cache
+def load_proxies():
+    return load_from_file(PROXY_FILE)
 
 def get_random_user_agent():
-    return random.choice(USER_AGENTS) if USER_AGENTS else None
+    user_agents = load_user_agents()
+    return random.choice(user_agents) if user_agents else None
 
 def get_random_proxy():
-    return random.choice(PROXIES) if PROXIES else None
+    proxies = load_proxies()
+    return random.choice(proxies) if proxies else None
 
 # Function to check if a file exists
 def file_exists(filename):
     return os.path.isfile(filename)
 
+# Format a datetime as the RFC 3339 UTC timestamp Helix expects
+def format_rfc3339(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+# Parse a CLI date such as 2024-10-01 or 2024-10-01T12:00:00Z (UTC if no offset)
+def parse_cli_datetime(value):
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected ISO 8601 such as 2024-10-01 or 2024-10-01T12:00:00Z")
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+# Read and write small JSON cache files; a missing or corrupt file reads as empty
+def load_json_cache(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_json_cache(path, data, mode=0o644):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode), 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+# One timed phase of work. Extra fields (clip_id, game, bytes, ...) are set
+# while the span is open and end up on its JSON line.
+class Span:
+    def __init__(self, phase: str, fields: dict):
+        self.phase = phase
+        self.fields = fields
+        self.outcome = 'ok'
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+
+    def set(self, **fields) -> None:
+        self.fields.update(fields)
+
+# Per-phase timing for token fetch, game lookup, clip listing, navigation, URL
+# extraction, HTTP download and disk write. Finished spans are appended to an
+# optional JSON lines file and summed per (phase, outcome) for Prometheus.
+class PhaseMetrics:
+    def __init__(self):
+        self.jsonl_file = None
+        self.totals: dict[tuple[str, str], list] = {}  # (phase, outcome) -> [count, seconds, bytes]
+
+    def open_jsonl(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.jsonl_file = open(path, 'a', buffering=1)
+
+    def close(self) -> None:
+        if self.jsonl_file is not None:
+            self.jsonl_file.close()
+            self.jsonl_file = None
+
+    # Time the enclosed block; an exception marks the span as 'error' (or
+    # 'cancelled') and is re-raised
+    @contextlib.contextmanager
+    def span(self, phase: str, **fields):
+        span = Span(phase, fields)
+        try:
+            yield span
+        except asyncio.CancelledError:
+            span.outcome = 'cancelled'
+            raise
+        except Exception:
+            span.outcome = 'error'
+            raise
+        finally:
+            self.record(phase, time.perf_counter() - span.start, span.outcome, span.started_at, **span.fields)
+
+    def record(self, phase: str, duration: float, outcome: str = 'ok', started_at: float | None = None, **fields) -> None:
+        totals = self.totals.setdefault((phase, outcome), [0, 0.0, 0])
+        totals[0] += 1
+        totals[1] += duration
+        totals[2] += fields.get('bytes') or 0
+        if self.jsonl_file is not None:
+            line = {'ts': started_at or time.time() - duration, 'phase': phase, 'duration_s': round(duration, 6), 'outcome': outcome, **fields}
+            self.jsonl_file.write(json.dumps(line) + "\n")
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# HELP poo7er_phase_seconds Time spent in each phase of the clip pipeline",
+            "# TYPE poo7er_phase_seconds summary",
+        ]
+        for (phase, outcome), (count, seconds, _) in sorted(self.totals.items()):
+            labels = f'phase="{phase}",outcome="{outcome}"'
+            lines.append(f"poo7er_phase_seconds_sum{{{labels}}} {seconds:.6f}")
+            lines.append(f"poo7er_phase_seconds_count{{{labels}}} {count}")
+        lines += [
+            "# HELP poo7er_phase_bytes_total Bytes handled in each phase",
+            "# TYPE poo7er_phase_bytes_total counter",
+        ]
+        for (phase, outcome), (_, _, byte_count) in sorted(self.totals.items()):
+            if phase in ('http_download', 'disk_write'):
+                lines.append(f'poo7er_phase_bytes_total{{phase="{phase}",outcome="{outcome}"}} {byte_count}')
+        return "\n".join(lines) + "\n"
+
+    async def handle_metrics(self, request):
+        import aiohttp.web
+        return aiohttp.web.Response(text=self.prometheus_text(), content_type='text/plain')
+
+metrics = PhaseMetrics()
+
+# Serve metrics.prometheus_text() at http://127.0.0.1:<port>/metrics
+async def start_metrics_server(port):
+    import aiohttp.web
+    app = aiohttp.web.Application()
+    app.router.add_get('/metrics', metrics.handle_metrics)
+    runner = aiohttp.web.AppRunner(app)
+    await runner.setup()
+    await aiohttp.web.TCPSite(runner, '127.0.0.1', port).start()
+    console.print(f"📈 Serving metrics on http://127.0.0.1:{port}/metrics", style=DRACULA_COLORS['cyan'])
+    return runner
+
 # Graceful exit handler for CTRL+C
 def signal_handler(sig, frame):
     console.print("🛑 Program terminated by user (CTRL+C). Exiting...", style=f"bold {DRACULA_COLORS['red']}")
     sys.exit(0)
 
-# Attach the signal handler
-signal.signal(signal.SIGINT, signal_handler)
-
-# Function to get OAuth token from Twitch
-async def get_twitch_oauth_token(client_id, client_secret):
-    if not client_id or not client_secret:
-        raise ValueError("CLIENT_ID and CLIENT_SECRET must be set in the .env file")
-    
-    url = 'https://id.twitch.tv/oauth2/token'
-    data = {
-        'client_id': client_id,
-        'client_secret': client_secret,
-        'grant_type': 'client_credentials'
-    }
-    async with aiohttp.ClientSession() as session:
-        async with session.post(url, data=data) as response:
-            if response.status == 200:
-                token_data = await response.json()
-                return token_data['access_token']
+# Paces Helix requests using the Ratelimit-Remaining/Ratelimit-Reset headers of
+# earlier responses. Every request takes a point from the remaining budget; once
+# it runs out, callers wait for the bucket to reset instead of guessing a rate.
+class HelixRateLimiter:
+    def __init__(self, reserve: int = HELIX_RATE_LIMIT_RESERVE):
+        self.reserve = reserve
+        self.remaining: int | None = None
+        self.reset_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            if self.remaining is None:
+                return
+            wait = self.reset_at - time.time()
+            if self.remaining <= self.reserve and wait > 0:
+                console.print(f"⏳ Helix rate limit reached, waiting {wait:.1f} seconds", style=DRACULA_COLORS['yellow'])
+                # Holding the lock makes every other request wait for the reset too
+                await asyncio.sleep(wait)
+                self.remaining = None
+            elif wait <= 0:
+                self.remaining = None
             else:
-                error_content = await response.text()
-                raise ValueError(f"Failed to get OAuth token. Status: {response.status}, Content: {error_content}")
-
-# Function to get game ID from game name
-async def get_game_id(game_name, oauth_token, client_id):
-    url = 'https://api.twitch.tv/helix/games'
-    headers = {
-        'Client-Id': client_id,
-        'Authorization': f'Bearer {oauth_token}'
-    }
-    params = {'name': game_name}
+                self.remaining -= 1
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                games = data.get('data', [])
-                return games[0]['id'] if games else None
+    def update(self, headers) -> None:
+        remaining, reset = headers.get('Ratelimit-Remaining'), headers.get('Ratelimit-Reset')
+        if remaining is None or reset is None:
+            return
+        remaining, reset_at = int(remaining), float(reset)
+        # Responses can arrive out of order, so within one window keep the lowest count
+        if self.remaining is not None and reset_at == self.reset_at:
+            remaining = min(remaining, self.remaining)
+        self.remaining, self.reset_at = remaining, reset_at
+
+    # Called on a 429: treat the bucket as empty until its reset time
+    def exhausted(self) -> None:
+        self.remaining = 0
+        if self.reset_at <= time.time():
+            self.reset_at = time.time() + 1
+
+# Shared Twitch API client. One keep-alive connector with DNS caching is used
+# for the whole run so Helix calls reuse the same TCP/TLS connections.
+class HelixClient:
+    TOKEN_URL = 'https://id.twitch.tv/oauth2/token'
+    HELIX_URL = 'https://api.twitch.tv/helix'
+
+    def __init__(self, client_id: str | None, client_secret: str | None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.oauth_token: str | None = None
+        self.token_expires_at = 0.0
+        self.token_lock = asyncio.Lock()
+        self.refresh_task: asyncio.Task | None = None
+        self.session: aiohttp.ClientSession | None = None
+        self.game_ids: dict[str, str | None] = {}
+        self.game_lock = asyncio.Lock()
+        self.rate_limiter = HelixRateLimiter()
+
+    async def __aenter__(self) -> 'HelixClient':
+        import aiohttp
+        connector = aiohttp.TCPConnector(ttl_dns_cache=300, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self) -> None:
+        if self.refresh_task is not None:
+            self.refresh_task.cancel()
+            self.refresh_task = None
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {
+            'Client-Id': self.client_id,
+            'Authorization': f'Bearer {self.oauth_token}'
+        }
+
+    # Return a valid app access token. A token cached on disk is reused until
+    # TOKEN_REFRESH_MARGIN before it expires; only then is id.twitch.tv called.
+    async def ensure_token(self) -> str:
+        if self.oauth_token and time.time() < self.token_expires_at - TOKEN_REFRESH_MARGIN:
+            return self.oauth_token
+
+        async with self.token_lock:
+            if self.oauth_token and time.time() < self.token_expires_at - TOKEN_REFRESH_MARGIN:
+                return self.oauth_token
+
+            cached = load_json_cache(TOKEN_CACHE_FILE)
+            if cached.get('client_id') == self.client_id and time.time() < cached.get('expires_at', 0) - TOKEN_REFRESH_MARGIN:
+                self.set_token(cached['access_token'], cached['expires_at'])
+                return self.oauth_token
+
+            return await self.get_oauth_token()
+
+    # Get OAuth token from Twitch
+    async def get_oauth_token(self) -> str:
+        if not self.client_id or not self.client_secret:
+            raise ValueError("CLIENT_ID and CLIENT_SECRET must be set in the .env file")
+
+        data = {
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'grant_type': 'client_credentials'
+        }
+        with metrics.span('token_fetch'):
+            async with self.session.post(self.TOKEN_URL, data=data) as response:
+                if response.status == 200:
+                    token_data = await response.json()
+                    expires_at = time.time() + token_data.get('expires_in', 0)
+                    self.set_token(token_data['access_token'], expires_at)
+                    save_json_cache(TOKEN_CACHE_FILE, {
+                        'client_id': self.client_id,
+                        'access_token': self.oauth_token,
+                        'expires_at': expires_at
+                    }, mode=0o600)
+                    return self.oauth_token
+                else:
+                    error_content = await response.text()
+                    raise ValueError(f"Failed to get OAuth token. Status: {response.status}, Content: {error_content}")
+
+    # Store a token and schedule its background refresh
+    def set_token(self, token: str, expires_at: float) -> None:
+        self.oauth_token = token
+        self.token_expires_at = expires_at
+        if self.refresh_task is not None:
+            self.refresh_task.cancel()
+        self.refresh_task = asyncio.create_task(self.refresh_token_later())
+
+    async def refresh_token_later(self) -> None:
+        await asyncio.sleep(max(0, self.token_expires_at - TOKEN_REFRESH_MARGIN - time.time()))
+        try:
+            async with self.token_lock:
+                # get_oauth_token replaces this task with a new one for the next token
+                self.refresh_task = None
+                await self.get_oauth_token()
+        except Exception as e:
+            console.print(f"Background token refresh failed: {str(e)}", style=DRACULA_COLORS['red'])
+
+    # GET a Helix endpoint through the shared rate limiter, fetching a new token
+    # once if the current one is rejected and waiting out any 429
+    async def get_json(self, path: str, params) -> dict:
+        await self.ensure_token()
+        refreshed = False
+        for attempt in range(HELIX_MAX_ATTEMPTS):
+            await self.rate_limiter.acquire()
+            token = self.oauth_token
+            async with self.session.get(f'{self.HELIX_URL}/{path}', headers=self.headers, params=params) as response:
+                self.rate_limiter.update(response.headers)
+                if response.status == 401 and not refreshed:
+                    refreshed = True
+                    async with self.token_lock:
+                        # Another request may already have replaced the rejected token
+                        if self.oauth_token == token:
+                            await self.get_oauth_token()
+                    continue
+                if response.status == 429:
+                    self.rate_limiter.exhausted()
+                    continue
+                if response.status != 200:
+                    raise Exception(f"Helix request to /{path} failed. Status: {response.status}")
+                return await response.json()
+        raise Exception(f"Helix request to /{path} failed after {HELIX_MAX_ATTEMPTS} attempts")
+
+    # Get game ID from game name. The first miss resolves every game in
+    # games_list along with it, so a run needs at most one /helix/games call.
+    async def get_game_id(self, game_name: str) -> str | None:
+        if game_name not in self.game_ids:
+            async with self.game_lock:
+                if game_name not in self.game_ids:
+                    await self.resolve_game_ids([game_name, *games_list])
+        return self.game_ids.get(game_name)
+
+    # Resolve game names to IDs from the on-disk cache, batching all misses
+    # into as few /helix/games requests as possible
+    async def resolve_game_ids(self, game_names: list[str]) -> dict[str, str | None]:
+        cache = load_json_cache(GAME_ID_CACHE_FILE)
+        now = time.time()
+        missing = []
+        for name in dict.fromkeys(game_names):
+            if name in self.game_ids:
+                continue
+            entry = cache.get(name)
+            if entry and now - entry['fetched_at'] < GAME_ID_CACHE_TTL:
+                self.game_ids[name] = entry['id']
             else:
-                raise Exception(f"Failed to get game ID. Status: {response.status}")
-
-# Function to get top clips for a specific game (filtered by clips no older than 4 weeks)
-async def get_top_clips(game_name, oauth_token, client_id, limit=5):
-    url = 'https://api.twitch.tv/helix/clips'
-    headers = {
-        'Client-Id': client_id,
-        'Authorization': f'Bearer {oauth_token}'
-    }
-
-    four_weeks_ago = (datetime.utcnow() - timedelta(weeks=4)).isoformat("T") + "Z"
-
-    game_id = await get_game_id(game_name, oauth_token, client_id)
-    if not game_id:
-        console.print(f"Game '{game_name}' not found.", style=f"bold {DRACULA_COLORS['red']}")
-        return []
-
-    params = {
-        'game_id': game_id,
-        'first': limit,
-        'started_at': four_weeks_ago
-    }
+                missing.append(name)
+
+        if missing:
+            for i in range(0, len(missing), HELIX_MAX_GAME_NAMES):
+                batch = missing[i:i + HELIX_MAX_GAME_NAMES]
+                with metrics.span('game_lookup', games=len(batch)):
+                    data = await self.get_json('games', [('name', name) for name in batch])
+
+                found = {game['name'].lower(): game['id'] for game in data.get('data', [])}
+                for name in batch:
+                    game_id = found.get(name.lower())
+                    self.game_ids[name] = game_id
+                    if game_id:
+                        cache[name] = {'id': game_id, 'fetched_at': now}
+            save_json_cache(GAME_ID_CACHE_FILE, cache)
+
+        return {name: self.game_ids.get(name) for name in game_names}
+
+    # Stream top clips for a specific game, following pagination cursors until
+    # `limit` clips have been yielded. The window defaults to the last 4 weeks.
+    async def get_top_clips(self, game_name: str, limit: int = 5, started_at: datetime | None = None, ended_at: datetime | None = None):
+        game_id = await self.get_game_id(game_name)
+        if not game_id:
+            console.print(f"Game '{game_name}' not found.", style=f"bold {DRACULA_COLORS['red']}")
+            return
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                return data.get('data', [])
-            else:
-                raise Exception(f"Failed to get clips. Status: {response.status}")
+        # Helix ends the window a week after started_at unless ended_at is given
+        ended_at = ended_at or datetime.now(timezone.utc)
+        started_at = started_at or ended_at - DEFAULT_CLIP_WINDOW
+        params = {
+            'game_id': game_id,
+            'started_at': format_rfc3339(started_at),
+            'ended_at': format_rfc3339(ended_at)
+        }
+
+        remaining = limit
+        while remaining > 0:
+            params['first'] = min(remaining, HELIX_MAX_PAGE_SIZE)
+            with metrics.span('clip_listing', game=game_name) as span:
+                data = await self.get_json('clips', params)
+                clips = data.get('data', [])
+                span.set(clips=len(clips))
+            for clip in clips[:remaining]:
+                clip['game_name'] = game_name
+                yield clip
+            remaining -= len(clips)
+
+            cursor = data.get('pagination', {}).get('cursor')
+            if not clips or not cursor:
+                return
+            params['after'] = cursor
+
+# Normalize a title for matching: compatibility forms, accents and case are
+# folded away, punctuation and emoji become spaces and whitespace is collapsed.
+# Titles made only of emoji or punctuation keep their casefolded characters so
+# they don't all normalize to the same empty key.
+def normalize_title(title):
+    text = unicodedata.normalize('NFKD', title.casefold())
+    text = ''.join(char if char.isalnum() else ' ' for char in text if not unicodedata.combining(char))
+    return ' '.join(text.split()) or ' '.join(title.casefold().split())
+
+# Character trigrams of a normalized title, padded so word starts weigh more
+def title_trigrams(title_key):
+    padded = f"  {title_key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+# Parts of [started_at, ended_at) not covered by the sorted (start, end) intervals
+def window_gaps(started_at, ended_at, covered):
+    gaps = []
+    cursor = started_at
+    for start, end in covered:
+        if start > cursor:
+            gaps.append((cursor, min(start, ended_at)))
+        cursor = max(cursor, end)
+        if cursor >= ended_at:
+            break
+    if cursor < ended_at:
+        gaps.append((cursor, ended_at))
+    return gaps
+
+def parse_rfc3339(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Persistent record of every clip seen, keyed by Helix clip ID. Skip and
+# status decisions are indexed lookups here rather than filesystem checks.
+class ClipManifest:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS clips (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            game_name TEXT,
+            game_id TEXT,
+            broadcaster_name TEXT,
+            view_count INTEGER,
+            created_at TEXT,
+            data TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'new',
+            file_path TEXT,
+            byte_size INTEGER,
+            checksum TEXT,
+            source_url TEXT,
+            error TEXT,
+            resolve_seconds REAL,
+            download_seconds REAL,
+            media TEXT,
+            verified_at REAL,
+            title_key TEXT,
+            first_seen_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS clips_title ON clips (title COLLATE NOCASE);
+        CREATE TABLE IF NOT EXISTS title_grams (
+            gram TEXT NOT NULL,
+            clip_id TEXT NOT NULL,
+            PRIMARY KEY (gram, clip_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS title_coverage (
+            game_name TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            ended_at TEXT NOT NULL,
+            covered_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS title_coverage_game ON title_coverage (game_name, started_at);
+        CREATE INDEX IF NOT EXISTS clips_file_path ON clips (file_path);
+        CREATE TABLE IF NOT EXISTS watch_state (
+            game_name TEXT PRIMARY KEY,
+            high_water TEXT NOT NULL,
+            polled_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = MANIFEST_FILE):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Sharded workers on one host share the manifest; wait for each other's writes
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(self.SCHEMA)
+        self.add_missing_columns()
+
+    # Columns added after the first release, for manifests created before them
+    def add_missing_columns(self) -> None:
+        columns = {row['name'] for row in self.db.execute("PRAGMA table_info(clips)")}
+        with self.db:
+            for name, column_type in [('media', 'TEXT'), ('verified_at', 'REAL'), ('title_key', 'TEXT')]:
+                if name not in columns:
+                    self.db.execute(f"ALTER TABLE clips ADD COLUMN {name} {column_type}")
+            self.db.execute("CREATE INDEX IF NOT EXISTS clips_title_key ON clips (title_key)")
+
+    def __enter__(self) -> 'ClipManifest':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    # Insert or refresh clip metadata without touching download state
+    def record_clips(self, clips: list[dict]) -> None:
+        now = time.time()
+        with self.db:
+            self.index_titles({clip['id']: clip['title'] for clip in clips})
+            self.db.executemany("""
+                INSERT INTO clips (id, title, game_name, game_id, broadcaster_name, view_count, created_at, data, title_key, first_seen_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    title = excluded.title,
+                    game_name = COALESCE(excluded.game_name, clips.game_name),
+                    view_count = excluded.view_count,
+                    data = excluded.data,
+                    title_key = excluded.title_key,
+                    updated_at = excluded.updated_at
+            """, [
+                (clip['id'], clip['title'], clip.get('game_name'), clip.get('game_id'), clip.get('broadcaster_name'),
+                 clip.get('view_count'), clip.get('created_at'), json.dumps(clip), normalize_title(clip['title']), now, now)
+                for clip in clips
+            ])
+
+    # Keep the title trigram index in step with clip titles. Only clips that
+    # are new, renamed or not yet indexed are (re)written.
+    def index_titles(self, titles: dict[str, str]) -> None:
+        ids = list(titles)
+        indexed = {}
+        for i in range(0, len(ids), 500):
+            batch = ids[i:i + 500]
+            rows = self.db.execute(f"SELECT id, title_key FROM clips WHERE id IN ({','.join('?' * len(batch))})", batch)
+            indexed.update((row['id'], row['title_key']) for row in rows)
+        for clip_id, title in titles.items():
+            title_key = normalize_title(title)
+            if indexed.get(clip_id) == title_key:
+                continue
+            if clip_id in indexed:
+                self.db.execute("DELETE FROM title_grams WHERE clip_id = ?", (clip_id,))
+            self.db.executemany("INSERT OR IGNORE INTO title_grams (gram, clip_id) VALUES (?, ?)",
+                                [(gram, clip_id) for gram in title_trigrams(title_key)])
+
+    # Index clips recorded before the title index existed, or with the empty key
+    # that emoji-only titles used to get
+    def backfill_title_index(self) -> None:
+        rows = self.db.execute("SELECT id, title FROM clips WHERE title_key IS NULL OR title_key = ''").fetchall()
+        if rows:
+            with self.db:
+                self.index_titles({row['id']: row['title'] for row in rows})
+                self.db.executemany("UPDATE clips SET title_key = ? WHERE id = ?",
+                                    [(normalize_title(row['title']), row['id']) for row in rows])
+
+    def get_statuses(self, clip_ids: list[str]) -> dict[str, str]:
+        statuses = {}
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(clip_ids), 500):
+            batch = clip_ids[i:i + 500]
+            rows = self.db.execute(
+                f"SELECT id, status FROM clips WHERE id IN ({','.join('?' * len(batch))})", batch
+            )
+            statuses.update({row['id']: row['status'] for row in rows})
+        return statuses
+
+    def is_downloaded(self, clip_id: str) -> bool:
+        row = self.db.execute("SELECT status FROM clips WHERE id = ?", (clip_id,)).fetchone()
+        return row is not None and row['status'] == 'downloaded'
+
+    # True until the clip is first downloaded or fails, i.e. it has no download history
+    def is_new(self, clip_id: str) -> bool:
+        row = self.db.execute("SELECT status, checksum FROM clips WHERE id = ?", (clip_id,)).fetchone()
+        return row is None or (row['status'] == 'new' and row['checksum'] is None)
+
+    # Pick a file path for a clip, falling back to a name suffixed with the clip
+    # ID when another clip with the same title already owns the plain name
+    def assign_file_path(self, clip: dict) -> str:
+        row = self.db.execute("SELECT file_path FROM clips WHERE id = ?", (clip['id'],)).fetchone()
+        # Paths assigned from unsanitized titles (with directories) are replaced
+        if row is not None and row['file_path'] and os.path.basename(row['file_path']) == row['file_path']:
+            return row['file_path']
+
+        file_path = clip_filename(clip)
+        owner = self.db.execute("SELECT id FROM clips WHERE file_path = ? AND id != ?", (file_path, clip['id'])).fetchone()
+        if owner is not None:
+            file_path = f"{file_path[:-len('.mp4')]}_{clip['id']}.mp4"
+
+        with self.db:
+            self.db.execute("UPDATE clips SET file_path = ? WHERE id = ?", (file_path, clip['id']))
+        return file_path
+
+    def mark_downloaded(self, clip_id: str, file_path: str, byte_size: int, checksum: str, source_url: str,
+                        resolve_seconds: float, download_seconds: float) -> None:
+        with self.db:
+            self.db.execute("""
+                UPDATE clips SET status = 'downloaded', file_path = ?, byte_size = ?, checksum = ?, source_url = ?,
+                    error = NULL, resolve_seconds = ?, download_seconds = ?, updated_at = ?
+                WHERE id = ?
+            """, (file_path, byte_size, checksum, source_url, resolve_seconds, download_seconds, time.time(), clip_id))
+
+    def mark_failed(self, clip_id: str, error: str) -> None:
+        with self.db:
+            self.db.execute(
+                "UPDATE clips SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                (error, time.time(), clip_id)
+            )
+
+    def mark_verified(self, clip_id: str, media: dict) -> None:
+        with self.db:
+            self.db.execute(
+                "UPDATE clips SET media = ?, verified_at = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(media), time.time(), time.time(), clip_id)
+            )
+
+    # Rank clips from every listing seen so far by title similarity. A title
+    # equal after normalization scores 1.0 and is found through the title_key
+    # index; otherwise clips sharing the most trigrams with the query are
+    # re-ranked by sequence similarity. Returns (score, clip, status), best first.
+    def search_titles(self, title: str, game_name: str | None = None, limit: int = 5) -> list[tuple[float, dict, str]]:
+        self.backfill_title_index()
+        title_key = normalize_title(title)
+        if not title_key:
+            return []
+        game_filter, game_params = (" AND clips.game_name = ?", [game_name]) if game_name else ("", [])
+
+        rows = self.db.execute(
+            f"SELECT data, status FROM clips WHERE title_key = ?{game_filter} ORDER BY view_count DESC LIMIT ?",
+            [title_key, *game_params, limit]
+        ).fetchall()
+        if rows:
+            return [(1.0, json.loads(row['data']), row['status']) for row in rows]
+
+        grams = list(title_trigrams(title_key))
+        candidates = self.db.execute(f"""
+            SELECT clips.id, clips.title_key, clips.data, clips.status, clips.view_count, COUNT(*) AS shared
+            FROM title_grams JOIN clips ON clips.id = title_grams.clip_id
+            WHERE title_grams.gram IN ({','.join('?' * len(grams))}){game_filter}
+            GROUP BY clips.id ORDER BY shared DESC LIMIT ?
+        """, [*grams, *game_params, TITLE_CANDIDATES]).fetchall()
+        ranked = sorted(
+            ((difflib.SequenceMatcher(None, title_key, row['title_key']).ratio(), row['view_count'] or 0, row) for row in candidates),
+            key=lambda item: item[:2], reverse=True
+        )
+        return [(score, json.loads(row['data']), row['status']) for score, _, row in ranked[:limit]]
+
+    # Windows of clip creation time whose listings were fetched to the end
+    def covered_windows(self, game_name: str) -> list[tuple[datetime, datetime]]:
+        rows = self.db.execute(
+            "SELECT started_at, ended_at FROM title_coverage WHERE game_name = ? ORDER BY started_at", (game_name,)
+        ).fetchall()
+        return [(parse_rfc3339(row['started_at']), parse_rfc3339(row['ended_at'])) for row in rows]
+
+    def add_coverage(self, game_name: str, started_at: datetime, ended_at: datetime) -> None:
+        with self.db:
+            self.db.execute(
+                "INSERT INTO title_coverage (game_name, started_at, ended_at, covered_at) VALUES (?, ?, ?, ?)",
+                (game_name, format_rfc3339(started_at), format_rfc3339(ended_at), time.time())
+            )
+
+    # Newest clip creation time seen by --watch for a game, as an RFC 3339 string
+    def get_high_water(self, game_name: str) -> str | None:
+        row = self.db.execute("SELECT high_water FROM watch_state WHERE game_name = ?", (game_name,)).fetchone()
+        return row['high_water'] if row else None
+
+    def set_high_water(self, game_name: str, high_water: str) -> None:
+        with self.db:
+            self.db.execute("""
+                INSERT INTO watch_state (game_name, high_water, polled_at) VALUES (?, ?, ?)
+                ON CONFLICT (game_name) DO UPDATE SET high_water = excluded.high_water, polled_at = excluded.polled_at
+            """, (game_name, high_water, time.time()))
 
 # Define a dictionary mapping locales to likely timezones
 LOCALE_TIMEZONE_MAP = {
@@ -176,7 +822,8 @@ LOCALE_TIMEZONE_MAP = {
     # Add more as needed
 }
 
-async def create_browser_context(playwright, headless=True):
+# Randomized, self-consistent fingerprint for a new browser context
+def random_context_options():
     user_agent = get_random_user_agent()
     
     # Choose a random locale
@@ -190,6 +837,7 @@ async def create_browser_context(playwright, headless=True):
     longitude = base_lon + random.uniform(-3, 3)
     
     # Get the current time in the chosen timezone
+    from zoneinfo import ZoneInfo
     current_time = datetime.now(ZoneInfo(timezone_id))
     
     context_options = {
@@ -208,12 +856,19 @@ async def create_browser_context(playwright, headless=True):
         'ignore_https_errors': True,
         'java_script_enabled': True,
     }
+    return user_agent, context_options
 
+async def create_browser_context(playwright, headless=True):
+    user_agent, context_options = random_context_options()
     browser = await playwright.firefox.launch(headless=headless)
-    context = await browser.new_context(**context_options)
+    try:
+        context = await browser.new_context(**context_options)
+    except Exception:
+        await browser.close()
+        raise
     browser_info = f"Firefox {browser.version}"
 
-    return browser, context, user_agent, PROXIES, context_options, browser_info
+    return browser, context, user_agent, load_proxies(), context_options, browser_info
 
 # Function to echo network information
 async def echo_network_info(user_agent, proxies, context_options, browser_info):
@@ -228,6 +883,7 @@ async def echo_network_info(user_agent, proxies, context_options, browser_info):
 
     console.print(f"[{DRACULA_COLORS['orange']}]Context Options[/{DRACULA_COLORS['orange']}]")
     
+    from rich.table import Table
     table = Table(show_header=False, show_lines=False, box=None, padding=(0, 2, 0, 0))
     table.add_column("Key", style=DRACULA_COLORS['cyan'])
     table.add_column("Value", style=DRACULA_COLORS['pink'])
@@ -271,20 +927,167 @@ def get_description(key):
 
 # Function to get IP address
 async def get_ip_address():
+    import aiohttp
     async with aiohttp.ClientSession() as session:
         async with session.get('https://api.ipify.org') as response:
             return await response.text()
 
-# Function to get video URL from clip page
-async def get_video_url(page, clip_url, proxies):
+# Browser that is only launched when a clip page actually has to be resolved,
+# so API-only work never pays for a Firefox cold start. Network information is
+# echoed in the background once the browser is up.
+class BrowserSession:
+    def __init__(self, headless: bool = True, show_network_info: bool = True, block_resources: bool = True):
+        self.headless = headless
+        self.show_network_info = show_network_info
+        self.resource_filter = ResourceFilter() if block_resources else None
+        self.playwright = None
+        self.browser = None
+        self.context: BrowserContext | None = None
+        self.page = None
+        self.launch_lock = asyncio.Lock()
+        self.network_info_task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> 'BrowserSession':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def get_context(self) -> 'BrowserContext':
+        async with self.launch_lock:
+            if self.context is None:
+                # A failed launch keeps Playwright running for the next attempt; close() stops it
+                if self.playwright is None:
+                    from playwright.async_api import async_playwright
+                    self.playwright = await async_playwright().start()
+                self.browser, self.context, user_agent, proxies, context_options, browser_info = await create_browser_context(self.playwright, self.headless)
+                if self.show_network_info:
+                    self.network_info_task = asyncio.create_task(echo_network_info(user_agent, proxies, context_options, browser_info))
+        return self.context
+
+    async def new_page(self):
+        context = await self.get_context()
+        page = await context.new_page()
+        if self.resource_filter is not None:
+            await page.route('**/*', self.resource_filter.handle)
+            page.on('close', self.resource_filter.forget)
+        return page
+
+    # Single page reused by the sequential download paths
+    async def shared_page(self):
+        if self.page is None:
+            self.page = await self.new_page()
+        return self.page
+
+    async def resolve_video_url(self, clip_url, page=None, timeout=VIDEO_URL_TIMEOUT):
+        page = page or await self.shared_page()
+        return await get_video_url(page, clip_url, load_proxies(), timeout=timeout, resource_filter=self.resource_filter)
+
+    async def close(self) -> None:
+        if self.network_info_task is not None:
+            try:
+                await asyncio.wait_for(self.network_info_task, timeout=5)
+            except Exception:
+                pass
+            self.network_info_task = None
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = self.context = self.page = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+
+# page.route handler that aborts resources not needed to find the media URL
+# and keeps per-page counts of what was blocked
+class ResourceFilter:
+    def __init__(self, resource_types=BLOCKED_RESOURCE_TYPES, url_patterns=BLOCKED_URL_PATTERNS):
+        self.resource_types = set(resource_types)
+        self.url_patterns = list(url_patterns)
+        self.blocked: dict[object, dict[str, int]] = {}
+        self.blocked_media: set[str] = set()
+        self.page_media: dict[object, set[str]] = {}  # page -> its blocked media URLs
+
+    def should_block(self, request) -> bool:
+        return request.resource_type in self.resource_types or any(pattern in request.url for pattern in self.url_patterns)
+
+    async def handle(self, route):
+        request = route.request
+        if not self.should_block(request):
+            await route.continue_()
+            return
+        counts = self.blocked.setdefault(request.frame.page, {})
+        counts[request.resource_type] = counts.get(request.resource_type, 0) + 1
+        if request.resource_type == 'media':
+            self.blocked_media.add(request.url)
+            self.page_media.setdefault(request.frame.page, set()).add(request.url)
+        await route.abort()
+
+    def reset(self, page) -> None:
+        self.blocked[page] = {}
+
+    def summary(self, page) -> str | None:
+        counts = self.blocked.get(page)
+        if not counts:
+            return None
+        details = ', '.join(f"{resource_type}: {count}" for resource_type, count in sorted(counts.items()))
+        return f"{sum(counts.values())} requests ({details})"
+
+    # True once per blocked in-page media stream, whose size is only known after our own download
+    def pop_blocked_media(self, url: str) -> bool:
+        if url in self.blocked_media:
+            self.blocked_media.discard(url)
+            return True
+        return False
+
+    # Drop a closed page's counts and media URLs, so long-lived processes such
+    # as the browser daemon don't accumulate them
+    def forget(self, page) -> None:
+        self.blocked.pop(page, None)
+        self.blocked_media.difference_update(self.page_media.pop(page, ()))
+
+# Resolves to the video element's src as soon as it is set. With mutation
+# polling Playwright re-checks from a MutationObserver instead of a timer.
+VIDEO_SRC_JS = """() => {
+    const videoElement = document.querySelector('video[src]');
+    return videoElement ? videoElement.src : null;
+}"""
+
+# True for the clip's own media request, e.g.
+# https://production.assets.clips.twitchcdn.net/v2/media/<slug>/<uuid>/video.mp4?sig=...
+def is_clip_media_request(request, slug):
+    path = urlparse(request.url).path
+    return path.endswith('.mp4') and slug in path
+
+async def simulate_interaction(page):
+    x, y = random.randint(0, 500), random.randint(0, 500)
+    console.print(f"🖱️ Simulating user interaction: Mouse move to ({x}, {y}) and click", style=DRACULA_COLORS['cyan'])
+    await page.mouse.move(x=x, y=y)
+    await page.mouse.down()
+    await page.mouse.up()
+
+# Function to get video URL from clip page. The URL is taken from whichever
+# comes first: the page requesting the clip media, or the video element's src
+# being set. Both are event-driven and share a single deadline.
+async def get_video_url(page, clip_url, proxies, timeout=VIDEO_URL_TIMEOUT, resource_filter=None):
     console.print(f"Navigating to clip URL: {clip_url}", style=DRACULA_COLORS['yellow'])
     start_time = time.time()
-    
+    slug = urlparse(clip_url).path.rstrip('/').rsplit('/', 1)[-1]
+
+    if resource_filter is not None:
+        resource_filter.reset(page)
+
+    # Listen before navigating so a media request fired during load is not missed
+    media_request = asyncio.ensure_future(page.wait_for_event(
+        'request', predicate=lambda request: is_clip_media_request(request, slug), timeout=timeout * 1000
+    ))
     try:
-        # Navigate to the page without waiting for load events
-        await page.goto(clip_url, wait_until='domcontentloaded', timeout=DEFAULT_TIMEOUT)
+        # Navigate to the page without waiting for load events. Navigation and
+        # extraction share one deadline of `timeout` seconds.
+        with metrics.span('navigation', clip_id=slug):
+            await page.goto(clip_url, wait_until='domcontentloaded', timeout=timeout * 1000)
         console.print(f"Initial page load completed in {time.time() - start_time:.2f} seconds", style=DRACULA_COLORS['cyan'])
     except Exception as e:
+        media_request.cancel()
         console.print(f"Error during page navigation: {str(e)}", style=DRACULA_COLORS['red'])
         return None
 
@@ -302,208 +1105,1427 @@ async def get_video_url(page, clip_url, proxies):
         if show_notification:
             console.print(f"🔇 Muted {num_videos_muted} video(s)", style=DRACULA_COLORS['cyan'])
 
-    # Initial mute with notification
-    await mute_video(show_notification=True)
-
     console.print("Searching for video element...", style=DRACULA_COLORS['yellow'])
+    extract_start = time.time()
+    # Playwright treats a timeout of 0 as no timeout, so never pass less than 1 ms
+    remaining = max(0.001, timeout - (time.time() - start_time))
+    video_src = asyncio.ensure_future(page.wait_for_function(VIDEO_SRC_JS, polling='mutation', timeout=remaining * 1000))
+    waiters = {media_request, video_src}
     video_url = None
-    max_attempts = 30
-    for attempt in range(max_attempts):
-        try:
-            # Mute video before each attempt (without notification)
-            await mute_video()
-            
-            # Simulate user interaction
-            x, y = random.randint(0, 500), random.randint(0, 500)
-            console.print(f"🖱️ Simulating user interaction: Mouse move to ({x}, {y}) and click", style=DRACULA_COLORS['cyan'])
-            await page.mouse.move(x=x, y=y)
-            await page.mouse.down()
-            await page.mouse.up()
-
-            # Check for video element
-            video_url = await page.evaluate('''() => {
-                const videoElement = document.querySelector('video[src]');
-                return videoElement ? videoElement.src : null;
-            }''')
-            
-            if video_url:
-                console.print(f"Video URL found on attempt {attempt + 1}", style=DRACULA_COLORS['green'])
+
+    try:
+        # Initial mute with notification
+        await mute_video(show_notification=True)
+
+        while waiters and not video_url:
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
                 break
-        except Exception as e:
-            console.print(f"Attempt {attempt + 1} failed: {str(e)}", style=DRACULA_COLORS['red'])
+            try:
+                await mute_video()
+                await simulate_interaction(page)
+            except Exception as e:
+                console.print(f"User interaction failed: {str(e)}", style=DRACULA_COLORS['red'])
+
+            done, waiters = await asyncio.wait(waiters, timeout=min(VIDEO_INTERACTION_INTERVAL, remaining), return_when=asyncio.FIRST_COMPLETED)
+            for waiter in done:
+                if waiter.exception() is not None:
+                    continue
+                if waiter is media_request:
+                    video_url = waiter.result().url
+                    console.print("Video URL found from media request", style=DRACULA_COLORS['green'])
+                else:
+                    video_url = await waiter.result().json_value()
+                    console.print("Video URL found on video element", style=DRACULA_COLORS['green'])
+                break
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
 
-        # Wait a short time before the next attempt
-        await asyncio.sleep(1)
+    metrics.record('url_extraction', time.time() - extract_start, 'ok' if video_url else 'timeout', extract_start, clip_id=slug)
 
     # Final mute without notification
-    await mute_video()
+    try:
+        await mute_video()
+    except Exception:
+        pass
+
+    blocked = resource_filter.summary(page) if resource_filter is not None else None
+    if blocked:
+        console.print(f"🚫 Blocked {blocked}", style=DRACULA_COLORS['comment'])
 
     if video_url:
         console.print(f"Signed URL Extracted in {time.time() - start_time:.2f} seconds: {video_url}", style=DRACULA_COLORS['green'])
         return video_url
     else:
-        console.print(f"Failed to extract video URL after {max_attempts} attempts", style=DRACULA_COLORS['red'])
+        console.print(f"Failed to extract video URL within {timeout:g} seconds", style=DRACULA_COLORS['red'])
         return None
     
 
-async def download_clip(page, session, clip, proxies):
-    filename = f"{clip['title'].replace(' ', '_')}.mp4"
-    if file_exists(filename):
+# Expiry (unix seconds) of a signed clip URL. Twitch clip URLs carry it in the
+# JSON `token` query parameter, e.g. ?sig=...&token={"expires":1730000000,...};
+# a plain `expires` parameter is accepted too. Returns None if neither is readable.
+def signed_url_expiry(url):
+    query = parse_qs(urlparse(url).query)
+    try:
+        if 'token' in query:
+            return float(json.loads(query['token'][0])['expires'])
+        if 'expires' in query:
+            return float(query['expires'][0])
+    except (ValueError, KeyError, TypeError):
+        pass
+    return None
+
+# Resolved media URLs per clip ID, so a retry after a CDN hiccup downloads the
+# same signed URL again instead of re-navigating the clip page. Entries are
+# dropped when they near expiry, when the CDN rejects them with 401/403, or
+# once the clip is downloaded.
+class SignedUrlCache:
+    def __init__(self):
+        self.urls: dict[str, tuple[str, float]] = {}
+
+    def get(self, clip_id: str) -> str | None:
+        entry = self.urls.get(clip_id)
+        if entry is None:
+            return None
+        url, expires_at = entry
+        if time.time() >= expires_at - SIGNED_URL_EXPIRY_MARGIN:
+            del self.urls[clip_id]
+            return None
+        return url
+
+    def put(self, clip_id: str, url: str) -> None:
+        self.urls[clip_id] = (url, signed_url_expiry(url) or time.time() + SIGNED_URL_DEFAULT_TTL)
+
+    def discard(self, clip_id: str) -> None:
+        self.urls.pop(clip_id, None)
+
+    # Forget the URL if the CDN refused it rather than failing transiently
+    def reject(self, clip_id: str, error: Exception) -> None:
+        import aiohttp
+        if isinstance(error, aiohttp.ClientResponseError) and error.status in (401, 403):
+            self.discard(clip_id)
+
+signed_urls = SignedUrlCache()
+
+# Long-lived browser server. Keeps one warm Firefox and resolves clip pages
+# for CLI runs over a small local HTTP API, so warm runs skip the browser cold
+# start. Every job gets a fresh context with its own randomized fingerprint.
+class BrowserDaemon:
+    def __init__(self, headless: bool = True, max_pages: int = BROWSER_DAEMON_MAX_PAGES,
+                 recycle_after: int = BROWSER_RECYCLE_PAGES, block_resources: bool = True):
+        self.headless = headless
+        self.recycle_after = recycle_after
+        self.resource_filter = ResourceFilter() if block_resources else None
+        self.slots = asyncio.Semaphore(max_pages)
+        self.playwright = None
+        self.browser = None
+        self.browser_lock = asyncio.Lock()
+        self.active_jobs = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.pages_served = 0
+        self.pages_since_launch = 0
+        self.launched_at: float | None = None
+        self.started_at = time.time()
+
+    # Return the browser and count the caller as an active job. When the browser
+    # is due for recycling, new jobs wait here until the running ones finish.
+    async def acquire_browser(self):
+        async with self.browser_lock:
+            if self.browser is not None and self.pages_since_launch >= self.recycle_after:
+                await self.idle.wait()
+                console.print(f"♻️ Recycling browser after {self.pages_since_launch} pages", style=DRACULA_COLORS['yellow'])
+                await self.close_browser()
+            elif self.browser is not None and not self.browser.is_connected():
+                console.print("Browser disconnected, relaunching", style=DRACULA_COLORS['yellow'])
+                await self.close_browser()
+            if self.browser is None:
+                if self.playwright is None:
+                    from playwright.async_api import async_playwright
+                    self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.firefox.launch(headless=self.headless)
+                self.launched_at = time.time()
+                self.pages_since_launch = 0
+                console.print(f"🦊 Launched Firefox {self.browser.version}", style=DRACULA_COLORS['green'])
+            self.active_jobs += 1
+            self.idle.clear()
+            return self.browser
+
+    def release_browser(self, served_page: bool = True) -> None:
+        self.active_jobs -= 1
+        if served_page:
+            self.pages_served += 1
+            self.pages_since_launch += 1
+        if self.active_jobs == 0:
+            self.idle.set()
+
+    async def close_browser(self) -> None:
+        try:
+            await self.browser.close()
+        except Exception:
+            pass
+        self.browser = None
+
+    async def resolve(self, clip_url: str, timeout: float = VIDEO_URL_TIMEOUT) -> str | None:
+        async with self.slots:
+            browser = await self.acquire_browser()
+            context = None
+            try:
+                user_agent, context_options = random_context_options()
+                context = await browser.new_context(**context_options)
+                page = await context.new_page()
+                if self.resource_filter is not None:
+                    await page.route('**/*', self.resource_filter.handle)
+                return await get_video_url(page, clip_url, load_proxies(), timeout=timeout, resource_filter=self.resource_filter)
+            finally:
+                if context is not None:
+                    if self.resource_filter is not None:
+                        for page in context.pages:
+                            self.resource_filter.forget(page)
+                    await context.close()
+                self.release_browser()
+
+    def health(self) -> dict:
+        return {
+            'status': 'ok' if self.browser is None or self.browser.is_connected() else 'disconnected',
+            'browser': f"Firefox {self.browser.version}" if self.browser is not None else None,
+            'uptime': time.time() - self.started_at,
+            'browser_age': time.time() - self.launched_at if self.launched_at else None,
+            'active_jobs': self.active_jobs,
+            'pages_served': self.pages_served,
+            'pages_since_launch': self.pages_since_launch,
+        }
+
+    async def handle_health(self, request):
+        import aiohttp.web
+        return aiohttp.web.json_response(self.health())
+
+    async def handle_resolve(self, request):
+        import aiohttp.web
+        body = await request.json()
+        video_url = await self.resolve(body['url'], float(body.get('timeout', VIDEO_URL_TIMEOUT)))
+        if not video_url:
+            return aiohttp.web.json_response({'error': 'Failed to extract video URL'}, status=502)
+        return aiohttp.web.json_response({'video_url': video_url})
+
+    async def close(self) -> None:
+        if self.browser is not None:
+            await self.close_browser()
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+
+async def run_browser_daemon(port=BROWSER_DAEMON_PORT, headless=True, block_resources=True):
+    import aiohttp.web
+    daemon = BrowserDaemon(headless=headless, block_resources=block_resources)
+    app = aiohttp.web.Application()
+    app.router.add_get('/health', daemon.handle_health)
+    app.router.add_post('/resolve', daemon.handle_resolve)
+    runner = aiohttp.web.AppRunner(app)
+    await runner.setup()
+    await aiohttp.web.TCPSite(runner, '127.0.0.1', port).start()
+    # Warm the browser up front so the first job doesn't pay for the launch
+    await daemon.acquire_browser()
+    daemon.release_browser(served_page=False)
+    console.print(f"Browser daemon listening on http://127.0.0.1:{port}", style=f"bold {DRACULA_COLORS['green']}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await daemon.close()
+
+# Client side of BrowserDaemon with the same interface as BrowserSession.
+# Clip pages are resolved by the daemon; if it doesn't pass a health check the
+# run falls back to launching its own browser.
+class RemoteBrowserSession:
+    def __init__(self, daemon_url: str, fallback: BrowserSession):
+        self.daemon_url = daemon_url.rstrip('/')
+        self.fallback = fallback
+        self.resource_filter = None
+        self.session: aiohttp.ClientSession | None = None
+        self.healthy: bool | None = None
+
+    async def __aenter__(self) -> 'RemoteBrowserSession':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def check_health(self) -> bool:
+        if self.healthy is None:
+            import aiohttp
+            self.session = aiohttp.ClientSession()
+            try:
+                async with self.session.get(f'{self.daemon_url}/health', timeout=aiohttp.ClientTimeout(total=2)) as response:
+                    self.healthy = response.status == 200 and (await response.json())['status'] == 'ok'
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError):
+                self.healthy = False
+            if self.healthy:
+                console.print(f"Using browser daemon at {self.daemon_url}", style=DRACULA_COLORS['cyan'])
+            else:
+                console.print(f"Browser daemon at {self.daemon_url} is unavailable, launching a local browser", style=DRACULA_COLORS['yellow'])
+                self.resource_filter = self.fallback.resource_filter
+        return self.healthy
+
+    async def new_page(self):
+        return None if await self.check_health() else await self.fallback.new_page()
+
+    async def shared_page(self):
+        return None if await self.check_health() else await self.fallback.shared_page()
+
+    async def resolve_video_url(self, clip_url, page=None, timeout=VIDEO_URL_TIMEOUT):
+        if not await self.check_health():
+            return await self.fallback.resolve_video_url(clip_url, page, timeout)
+        console.print(f"Resolving clip URL via daemon: {clip_url}", style=DRACULA_COLORS['yellow'])
+        start_time = time.time()
+        async with self.session.post(f'{self.daemon_url}/resolve', json={'url': clip_url, 'timeout': timeout}) as response:
+            if response.status != 200:
+                return None
+            video_url = (await response.json())['video_url']
+        console.print(f"Signed URL Extracted in {time.time() - start_time:.2f} seconds: {video_url}", style=DRACULA_COLORS['green'])
+        return video_url
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        await self.fallback.close()
+
+# One progress display for a whole run: a status line for the URL-resolution
+# queue, a row per active transfer and a total row with throughput and ETA.
+# Rendering happens on Live's own timer at DASHBOARD_REFRESH_PER_SECOND, so
+# its cost doesn't grow with the number of chunks or transfers. Without a TTY
+# (e.g. cron) it prints a plain status line every DASHBOARD_PLAIN_INTERVAL
+# seconds instead. Transfers use the same add_task/update/remove_task calls as
+# rich's Progress.
+class DownloadDashboard:
+    def __init__(self, plain: bool | None = None):
+        from rich.progress import Progress, BarColumn, TextColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
+        self.plain = not console.is_terminal if plain is None else plain
+        self.progress = Progress(
+            TextColumn("{task.description}"), BarColumn(), DownloadColumn(), TransferSpeedColumn(), TimeRemainingColumn(),
+            console=console, auto_refresh=False,
+        )
+        self.total_task = self.progress.add_task("[bold]Total", total=0)
+        self.transfers: dict = {}  # task id -> [completed, total]
+        self.finished_bytes = 0
+        self.finished_count = 0
+        self.resolving = 0
+        self.queues: tuple[asyncio.Queue, asyncio.Queue] | None = None
+        self.live = None
+        self.last_log = time.monotonic()
+        self.last_log_bytes = 0
+
+    def __enter__(self) -> 'DownloadDashboard':
+        if not self.plain:
+            from rich.live import Live
+            self.live = Live(self, console=console, refresh_per_second=DASHBOARD_REFRESH_PER_SECOND, transient=True)
+            self.live.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.live is not None:
+            self.live.stop()
+            self.live = None
+
+    # Queues of clips waiting for a browser page and resolved clips waiting for a downloader
+    def track_queues(self, resolve_queue: asyncio.Queue, download_queue: asyncio.Queue) -> None:
+        self.queues = (resolve_queue, download_queue)
+
+    def add_task(self, description, total=None, completed=0):
+        task_id = self.progress.add_task(description, total=total, completed=completed)
+        self.transfers[task_id] = [completed, total]
+        return task_id
+
+    def update(self, task_id, advance=0) -> None:
+        self.progress.update(task_id, advance=advance)
+        self.transfers[task_id][0] += advance
+        if self.plain and time.monotonic() - self.last_log >= DASHBOARD_PLAIN_INTERVAL:
+            self.log_status()
+
+    def remove_task(self, task_id) -> None:
+        completed, total = self.transfers.pop(task_id)
+        self.progress.remove_task(task_id)
+        # Only finished transfers count towards the total; a failed one is retried from its .part file
+        if total is None or completed >= total:
+            self.finished_bytes += completed
+            self.finished_count += 1
+
+    def totals(self) -> tuple[int, int]:
+        # Snapshot first: Live renders from its own thread
+        transfers = list(self.transfers.values())
+        completed = self.finished_bytes + sum(completed for completed, _ in transfers)
+        total = self.finished_bytes + sum(total or completed for completed, total in transfers)
+        return completed, total
+
+    def status_text(self) -> str:
+        parts = [f"⬇️ {len(self.transfers)} downloading", f"🔎 {self.resolving} resolving"]
+        if self.queues is not None:
+            resolve_queue, download_queue = self.queues
+            parts.append(f"{resolve_queue.qsize()} waiting for a page")
+            parts.append(f"{download_queue.qsize()} waiting for a download slot")
+        parts.append(f"✅ {self.finished_count} finished")
+        return " · ".join(parts)
+
+    def log_status(self) -> None:
+        now = time.monotonic()
+        completed, total = self.totals()
+        speed = (completed - self.last_log_bytes) / max(now - self.last_log, 1e-9)
+        eta = f", ETA {(total - completed) / speed:.0f}s" if speed > 0 and total > completed else ""
+        console.print(f"{self.status_text()} · {completed / (1024 * 1024):.1f}/{total / (1024 * 1024):.1f} MB at {speed / (1024 * 1024):.1f} MB/s{eta}",
+                      style=DRACULA_COLORS['comment'])
+        self.last_log, self.last_log_bytes = now, completed
+
+    # Called by Live on each refresh
+    def __rich__(self):
+        completed, total = self.totals()
+        self.progress.update(self.total_task, completed=completed, total=total or None)
+        return Group(Text(self.status_text(), style=DRACULA_COLORS['comment']), self.progress)
+
+# Token bucket shared by every download in the process. Each chunk read from
+# the network takes its size in tokens; once the bucket is in debt, readers
+# sleep until it refills, which backs off the TCP stream. The bucket holds at
+# most one second of tokens, so idle time doesn't turn into a burst.
+class BandwidthLimiter:
+    def __init__(self, rate: float = 0):
+        self.rate = rate  # bytes per second, 0 = unlimited
+        self.tokens = rate
+        self.updated_at = time.monotonic()
+
+    def set_rate(self, rate: float) -> None:
+        self.rate = self.tokens = rate
+        self.updated_at = time.monotonic()
+
+    async def consume(self, size: int) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated_at) * self.rate) - size
+        self.updated_at = now
+        if self.tokens < 0:
+            await asyncio.sleep(-self.tokens / self.rate)
+
+bandwidth = BandwidthLimiter(MAX_BANDWIDTH * 1024 * 1024)
+
+# HTTP session for clip downloads, capping connections per CDN host
+def create_download_session():
+    import aiohttp
+    connector = aiohttp.TCPConnector(limit_per_host=DOWNLOAD_CONNECTIONS_PER_HOST, ttl_dns_cache=300, keepalive_timeout=60)
+    return aiohttp.ClientSession(connector=connector)
+
+# Function to stream a resolved video URL to disk. Data goes to a .part file
+# that is resumed with a Range request on retry and only renamed into place once
+# its size matches what the server promised. Returns the number of bytes
+# written and their SHA-256 checksum. `clip` only labels the timing spans.
+async def fetch_clip_file(session, video_url, filename, progress=None, clip=None):
+    part_path = f"{filename}.part"
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    headers = {'Range': f'bytes={offset}-'} if offset else {}
+    fields = {'clip_id': clip['id'], 'game': clip.get('game_name')} if clip else {}
+
+    with metrics.span('http_download', **fields) as span:
+        async with session.get(video_url, headers=headers) as response:
+            if response.status == 416:
+                # Our partial file is no longer valid for this resource; start over
+                os.remove(part_path)
+                span.outcome = 'restarted'
+                return await fetch_clip_file(session, video_url, filename, progress, clip)
+            response.raise_for_status()
+
+            if response.status == 206:
+                total_size = parse_content_range_total(response.headers.get('content-range'))
+                checksum = await asyncio.to_thread(hash_file, part_path)
+            else:
+                # The server sent the whole file, so any partial data is discarded
+                offset = 0
+                total_size = int(response.headers.get('content-length', 0)) or None
+                checksum = hashlib.sha256()
+
+            if progress is None:
+                with DownloadDashboard() as progress:
+                    byte_size = await write_response(response, part_path, progress, offset, total_size, checksum, fields=fields)
+            else:
+                byte_size = await write_response(response, part_path, progress, offset, total_size, checksum, fields=fields)
+
+        span.set(bytes=byte_size - offset, resumed_from=offset)
+        if total_size is not None and byte_size != total_size:
+            raise Exception(f"Incomplete download: got {byte_size} of {total_size} bytes")
+    os.replace(part_path, filename)
+    return byte_size, checksum.hexdigest()
+
+async def write_response(response, part_path, progress, offset, total_size, checksum,
+                         chunk_size=DOWNLOAD_CHUNK_SIZE, buffer_size=WRITE_BUFFER_SIZE, fields=None):
+    download_task = progress.add_task(f"[cyan]{os.path.basename(part_path)[:40]}", total=total_size, completed=offset)
+    byte_size = offset
+    reported = offset
+    last_report = time.monotonic()
+    writer = ClipFileWriter(part_path, offset, total_size, buffer_size)
+    try:
+        await writer.open()
+        async for chunk in response.content.iter_chunked(chunk_size):
+            if bandwidth.rate:
+                await bandwidth.consume(len(chunk))
+            await writer.write(chunk)
+            checksum.update(chunk)
+            byte_size += len(chunk)
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_REFRESH_INTERVAL:
+                progress.update(download_task, advance=byte_size - reported)
+                reported, last_report = byte_size, now
+        progress.update(download_task, advance=byte_size - reported)
+    finally:
+        await writer.close()
+        progress.remove_task(download_task)
+        # Disk time is summed across the writer's flushes rather than timed as one block
+        metrics.record('disk_write', writer.write_seconds, bytes=writer.bytes_written, **(fields or {}))
+    return byte_size
+
+# Buffered clip writer. Chunks are coalesced in memory and flushed to disk in
+# large writes on a worker thread, so the event loop makes one thread hop per
+# buffer instead of one per network chunk. Space for the expected size is
+# reserved up front where the platform allows it.
+class ClipFileWriter:
+    def __init__(self, path: str, offset: int, total_size: int | None, buffer_size: int = WRITE_BUFFER_SIZE):
+        self.path = path
+        self.offset = offset
+        self.total_size = total_size
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+        self.file = None
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+
+    async def open(self) -> None:
+        start = time.perf_counter()
+        self.file = await asyncio.to_thread(open, self.path, 'ab' if self.offset else 'wb')
+        if self.total_size and self.total_size > self.offset:
+            await asyncio.to_thread(preallocate, self.file.fileno(), self.offset, self.total_size - self.offset)
+        self.write_seconds += time.perf_counter() - start
+
+    async def write(self, chunk: bytes) -> None:
+        self.buffer += chunk
+        if len(self.buffer) >= self.buffer_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if self.buffer:
+            data, self.buffer = self.buffer, bytearray()
+            start = time.perf_counter()
+            await asyncio.to_thread(self.file.write, data)
+            self.write_seconds += time.perf_counter() - start
+            self.bytes_written += len(data)
+
+    async def close(self) -> None:
+        if self.file is None:
+            return
+        try:
+            await self.flush()
+        finally:
+            start = time.perf_counter()
+            await asyncio.to_thread(self.file.close)
+            self.write_seconds += time.perf_counter() - start
+            self.file = None
+
+# Reserve disk blocks without changing the file size, so an interrupted .part
+# file still reports exactly the bytes written and can be resumed. Uses Linux
+# fallocate(FALLOC_FL_KEEP_SIZE); elsewhere this is a no-op.
+FALLOC_FL_KEEP_SIZE = 0x01
+libc_fallocate = None
+
+def preallocate(fd, offset, length):
+    global libc_fallocate
+    if not sys.platform.startswith('linux'):
+        return
+    if libc_fallocate is None:
+        try:
+            import ctypes
+            import ctypes.util
+            libc_fallocate = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True).fallocate
+            libc_fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+        except (OSError, AttributeError):
+            libc_fallocate = False
+    # Failure (e.g. a filesystem without fallocate support) only loses the optimisation
+    if libc_fallocate:
+        libc_fallocate(fd, FALLOC_FL_KEEP_SIZE, offset, length)
+
+# Total resource size from a `Content-Range: bytes start-end/total` header
+def parse_content_range_total(content_range):
+    if not content_range or '/' not in content_range:
+        return None
+    total = content_range.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
+
+def hash_file(path):
+    checksum = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            checksum.update(block)
+    return checksum
+
+# Readable file name for a clip in the working directory. Path separators and
+# NUL are replaced so a title can't name a directory or escape the working
+# directory (e.g. '../../x' becomes '.._.._x.mp4').
+def clip_filename(clip):
+    name = clip['title'].replace(' ', '_')
+    for separator in ('/', '\\', os.sep, os.altsep or '/', '\0'):
+        name = name.replace(separator, '_')
+    return f"{name or clip['id']}.mp4"
+
+# Content-addressed clip storage. Downloads are staged per clip ID under
+# partial/ (so a resume doesn't depend on the title), then moved to
+# objects/<sha256[:2]>/<sha256[2:4]>/<sha256>.mp4 and exposed under their
+# human-readable name as a hard link, or a symlink where hard links aren't
+# possible. Clips with identical bytes share one object, and no directory holds
+# more than a few hundred entries however large the archive grows.
+class ClipStore:
+    def __init__(self, root: str = STORE_DIR):
+        self.root = root
+
+    def staging_path(self, clip_id: str) -> str:
+        os.makedirs(os.path.join(self.root, 'partial'), exist_ok=True)
+        return os.path.join(self.root, 'partial', f"{clip_id}.mp4")
+
+    def object_path(self, checksum: str) -> str:
+        return os.path.join(self.root, 'objects', checksum[:2], checksum[2:4], f"{checksum}.mp4")
+
+    # Move a finished download into the store and link it at file_path.
+    # Returns True if identical content was already stored.
+    def commit(self, clip_id: str, checksum: str, file_path: str) -> bool:
+        staged_path = self.staging_path(clip_id)
+        object_path = self.object_path(checksum)
+        duplicate = os.path.exists(object_path)
+        if duplicate:
+            os.remove(staged_path)
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            os.replace(staged_path, object_path)
+        self.link(object_path, file_path)
+        return duplicate
+
+    # Bring a file that predates the store into it, leaving the file in place
+    def adopt(self, file_path: str, checksum: str) -> None:
+        object_path = self.object_path(checksum)
+        if os.path.exists(object_path):
+            return
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        try:
+            os.link(os.path.realpath(file_path), object_path)
+        except OSError:
+            # e.g. the store is on another filesystem; the file is still recorded
+            pass
+
+    def link(self, object_path: str, file_path: str) -> None:
+        if os.path.exists(file_path) and os.path.samefile(file_path, object_path):
+            return
+        # Link under a temporary name and rename over file_path so it is replaced atomically
+        tmp_path = f"{file_path}.link"
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        try:
+            os.link(object_path, tmp_path)
+        except OSError:
+            # e.g. the store is on another filesystem
+            os.symlink(os.path.abspath(object_path), tmp_path)
+        os.replace(tmp_path, file_path)
+
+clip_store = ClipStore()
+
+# Work splitting for --shards N --shard-index i. Clip IDs map to shards by a
+# stable hash, so a clip always belongs to the same worker whichever process
+# or machine runs it. Before a worker resolves a clip it takes a lease file
+# (created with O_EXCL, which is atomic on local and network filesystems), so
+# overlapping runs or a changed shard count never fetch a clip twice. A
+# finished clip leaves a marker at done/<sha1[:2]>/<sha1[2:4]>/<clip_id>.done
+# under the lease directory, spread out like the clip store, so workers with
+# their own manifests (e.g. on other machines) skip it too. Leases are released once
+# the clip is recorded or finally fails; a crashed worker's leases can be taken
+# over after LEASE_TTL.
+class ShardCoordinator:
+    def __init__(self, lease_dir: str = LEASE_DIR):
+        self.shards = 1
+        self.index = 0
+        self.lease_dir = lease_dir
+        self.owner = f"{platform.node()}:{os.getpid()}"
+        self.held: set[str] = set()
+
+    def configure(self, shards: int, index: int) -> None:
+        self.shards, self.index = shards, index
+        os.makedirs(self.lease_dir, exist_ok=True)
+
+    def shard_of(self, clip_id: str) -> int:
+        return int.from_bytes(hashlib.sha1(clip_id.encode()).digest()[:8], 'big') % self.shards
+
+    def owns(self, clip_id: str) -> bool:
+        return self.shard_of(clip_id) == self.index
+
+    # Pass through only this worker's clips
+    async def filter(self, clips):
+        async for clip in clips:
+            if self.owns(clip['id']):
+                yield clip
+
+    def lease_path(self, clip_id: str) -> str:
+        return os.path.join(self.lease_dir, f"{clip_id}.lease")
+
+    def done_path(self, clip_id: str) -> str:
+        digest = hashlib.sha1(clip_id.encode()).hexdigest()
+        return os.path.join(self.lease_dir, 'done', digest[:2], digest[2:4], f"{clip_id}.done")
+
+    def completed(self, clip_id: str) -> bool:
+        return self.shards > 1 and os.path.exists(self.done_path(clip_id))
+
+    def acquire(self, clip_id: str) -> bool:
+        if self.shards == 1:
+            return True
+        path = self.lease_path(clip_id)
+        if clip_id in self.held:
+            # Retries renew our own lease
+            os.utime(path)
+            return True
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                if not self.take_over_stale(path):
+                    return False
+                continue
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'owner': self.owner, 'acquired_at': time.time()}, f)
+            self.held.add(clip_id)
+            return True
+        return False
+
+    # Move an expired lease aside so it can be recreated. Only one contender's
+    # rename succeeds; if what it moved turns out to be fresh it is put back.
+    def take_over_stale(self, path: str) -> bool:
+        try:
+            if time.time() - os.path.getmtime(path) < LEASE_TTL:
+                return False
+            stale_path = f"{path}.{self.owner.replace(':', '-')}.stale"
+            os.rename(path, stale_path)
+        except FileNotFoundError:
+            return True
+        try:
+            if time.time() - os.path.getmtime(stale_path) < LEASE_TTL:
+                os.link(stale_path, path)
+                return False
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(stale_path)
+        return True
+
+    def release(self, clip_id: str) -> None:
+        if clip_id in self.held:
+            self.held.discard(clip_id)
+            try:
+                os.remove(self.lease_path(clip_id))
+            except FileNotFoundError:
+                pass
+
+    # Forget a finished clip, e.g. when its file failed verification, so it is
+    # downloaded again
+    def reopen(self, clip_id: str) -> None:
+        try:
+            os.remove(self.done_path(clip_id))
+        except FileNotFoundError:
+            pass
+
+    # Leave the .done marker, then drop the lease
+    def complete(self, clip_id: str) -> None:
+        if clip_id in self.held:
+            done_path = self.done_path(clip_id)
+            os.makedirs(os.path.dirname(done_path), exist_ok=True)
+            with open(done_path, 'w') as f:
+                json.dump({'owner': self.owner, 'completed_at': time.time()}, f)
+            self.release(clip_id)
+
+    def release_all(self) -> None:
+        for clip_id in list(self.held):
+            self.release(clip_id)
+
+shard = ShardCoordinator()
+
+# Local supervisor for --shards N: runs one worker process per shard with the
+# same arguments plus --shard-index, and prefixes each worker's output
+async def run_shard_supervisor(shards):
+    colors = [DRACULA_COLORS[name] for name in ('cyan', 'green', 'orange', 'pink', 'purple', 'yellow')]
+
+    async def run_worker(index):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, *sys.argv, '--shard-index', str(index),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+        )
+        try:
+            # Workers write to a pipe, so their dashboards fall back to plain status lines
+            async for line in process.stdout:
+                console.print(f"[shard {index}]", line.decode(errors='replace').rstrip(), style=colors[index % len(colors)], markup=False, highlight=False)
+            return await process.wait()
+        finally:
+            if process.returncode is None:
+                process.terminate()
+                await process.wait()
+
+    console.print(f"🧩 Starting {shards} shard workers", style=f"bold {DRACULA_COLORS['cyan']}")
+    return_codes = await asyncio.gather(*(run_worker(index) for index in range(shards)))
+    failed = [index for index, code in enumerate(return_codes) if code != 0]
+    if failed:
+        console.print(f"❌ Shard workers {failed} exited with errors", style=f"bold {DRACULA_COLORS['red']}")
+        return 1
+    console.print(f"✅ All {shards} shard workers finished", style=f"bold {DRACULA_COLORS['green']}")
+    return 0
+
+# Walk the boxes in data[offset:end], yielding (type, payload start, box end)
+def iter_mp4_boxes(data, offset, end):
+    while offset + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', data, offset)
+        header_size = 8
+        if size == 1:
+            size, header_size = struct.unpack_from('>Q', data, offset + 8)[0], 16
+        elif size == 0:
+            size = end - offset
+        box_type = box_type.decode('latin-1')
+        if size < header_size or offset + size > end:
+            raise ValueError(f"malformed '{box_type}' box")
+        yield box_type, offset + header_size, offset + size
+        offset += size
+
+def find_mp4_box(data, start, end, path):
+    for box_type, payload, box_end in iter_mp4_boxes(data, start, end):
+        if box_type == path[0]:
+            return (payload, box_end) if len(path) == 1 else find_mp4_box(data, payload, box_end, path[1:])
+    return None
+
+# Read one track's handler, codec and (for video) dimensions into info
+def parse_mp4_track(moov, start, end, info):
+    hdlr = find_mp4_box(moov, start, end, ['mdia', 'hdlr'])
+    stsd = find_mp4_box(moov, start, end, ['mdia', 'minf', 'stbl', 'stsd'])
+    if hdlr is None or stsd is None:
+        return
+    handler = moov[hdlr[0] + 8:hdlr[0] + 12].decode('latin-1')
+    # First sample entry after version/flags and entry_count, e.g. avc1, hvc1, mp4a
+    codec = moov[stsd[0] + 12:stsd[0] + 16].decode('latin-1') if stsd[1] - stsd[0] >= 16 else None
+    if handler == 'vide' and info['video_codec'] is None:
+        info['video_codec'] = codec
+        tkhd = find_mp4_box(moov, start, end, ['tkhd'])
+        if tkhd is not None:
+            # 16.16 fixed-point width and height close the tkhd box
+            width, height = struct.unpack_from('>II', moov, tkhd[1] - 8)
+            info['width'], info['height'] = width >> 16, height >> 16
+    elif handler == 'soun' and info['audio_codec'] is None:
+        info['audio_codec'] = codec
+
+# Check that an MP4 is structurally complete (ftyp first, then moov and mdat,
+# with the top-level boxes exactly covering the file) and read its duration,
+# codecs and dimensions from moov. Only box headers and moov are read, never
+# the media data. Runs in a worker process, so it takes and returns plain data.
+def parse_mp4(path):
+    info = {'valid': False, 'error': None, 'major_brand': None, 'duration': None,
+            'video_codec': None, 'width': None, 'height': None, 'audio_codec': None, 'boxes': []}
+    try:
+        file_size = os.path.getsize(path)
+        moov = None
+        with open(path, 'rb') as f:
+            offset = 0
+            while offset < file_size:
+                header = f.read(16)
+                if len(header) < 8:
+                    raise ValueError(f"truncated box header at byte {offset}")
+                size, box_type = struct.unpack_from('>I4s', header)
+                header_size = 8
+                if size == 1:
+                    size, header_size = struct.unpack_from('>Q', header, 8)[0], 16
+                elif size == 0:
+                    size = file_size - offset
+                box_type = box_type.decode('latin-1')
+                if offset == 0 and box_type != 'ftyp':
+                    raise ValueError("not an MP4: no ftyp box at start of file")
+                if size < header_size:
+                    raise ValueError(f"malformed '{box_type}' box at byte {offset}")
+                if offset + size > file_size:
+                    raise ValueError(f"truncated: '{box_type}' box needs {offset + size} bytes, file has {file_size}")
+                info['boxes'].append(box_type)
+                if box_type == 'ftyp':
+                    info['major_brand'] = header[header_size:header_size + 4].decode('latin-1').strip()
+                elif box_type == 'moov':
+                    f.seek(offset + header_size)
+                    moov = f.read(size - header_size)
+                offset += size
+                f.seek(offset)
+
+        for required in ('ftyp', 'moov', 'mdat'):
+            if required not in info['boxes']:
+                raise ValueError(f"missing {required} box")
+
+        for box_type, start, end in iter_mp4_boxes(moov, 0, len(moov)):
+            if box_type == 'mvhd':
+                if moov[start] == 1:
+                    timescale, duration = struct.unpack_from('>IQ', moov, start + 20)
+                else:
+                    timescale, duration = struct.unpack_from('>II', moov, start + 12)
+                info['duration'] = round(duration / timescale, 3) if timescale else None
+            elif box_type == 'trak':
+                parse_mp4_track(moov, start, end, info)
+        if info['video_codec'] is None:
+            raise ValueError("no video track")
+        info['valid'] = True
+    except (OSError, ValueError, struct.error) as e:
+        info['error'] = str(e)
+    return info
+
+# Optional post-download stage (--verify). Each finished clip is parsed with
+# parse_mp4 in a process pool, so large files never stall the download loop;
+# the result goes to the manifest and to a <name>.info.json sidecar. Clips that
+# fail the check are removed from the working directory and the store and
+# marked failed, so the next run downloads them again.
+class ClipVerifier:
+    def __init__(self, workers: int = VERIFY_WORKERS):
+        self.enabled = False
+        self.workers = workers
+        self.pool = None
+        self.tasks: set[asyncio.Task] = set()
+
+    def submit(self, manifest, clip: dict, file_path: str, checksum: str) -> None:
+        if not self.enabled:
+            return
+        task = asyncio.create_task(self.verify(manifest, clip, file_path, checksum))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def verify(self, manifest, clip, file_path, checksum) -> bool:
+        if self.pool is None:
+            # spawn rather than fork: the parent has a running loop and helper threads
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        with metrics.span('verify', clip_id=clip['id'], game=clip.get('game_name')) as span:
+            media = await asyncio.get_running_loop().run_in_executor(self.pool, parse_mp4, file_path)
+            span.outcome = 'ok' if media['valid'] else 'invalid'
+
+        if not media['valid']:
+            console.print(f"❌ {file_path} failed MP4 verification: {media['error']}", style=f"bold {DRACULA_COLORS['red']}")
+            for path in (file_path, clip_store.object_path(checksum)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            manifest.mark_failed(clip['id'], f"MP4 verification failed: {media['error']}")
+            shard.reopen(clip['id'])
+            return False
+
+        manifest.mark_verified(clip['id'], media)
+        sidecar = {'file': file_path, 'sha256': checksum, 'media': media, 'clip': clip}
+        save_json_cache(f"{os.path.splitext(file_path)[0]}.info.json", sidecar)
+        resolution = f", {media['width']}x{media['height']}" if media['width'] else ""
+        console.print(f"🔍 Verified {file_path}: {media['duration']}s {media['video_codec']}{resolution}", style=DRACULA_COLORS['green'])
+        return True
+
+    # Wait for verifications still in flight, e.g. before the manifest is closed
+    async def drain(self) -> None:
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+verifier = ClipVerifier()
+
+def print_download_summary(filename, byte_size, download_time):
+    console.print(f"✅ Clip downloaded successfully: {filename}", style=DRACULA_COLORS['green'])
+    console.print(f"File size: {byte_size / (1024 * 1024):.2f} MB", style=DRACULA_COLORS['yellow'])
+    console.print(f"Download time: {download_time:.2f} seconds", style=DRACULA_COLORS['yellow'])
+
+# Move a finished download into the store, record it in the manifest and print its summary
+def finish_download(manifest, clip, filename, video_url, result, start_time, resolved_time, resource_filter=None):
+    byte_size, checksum = result
+    if clip_store.commit(clip['id'], checksum, filename):
+        console.print(f"♻️ Identical content already stored, linked {filename} to it", style=DRACULA_COLORS['cyan'])
+    end_time = time.time()
+    signed_urls.discard(clip['id'])
+    manifest.mark_downloaded(clip['id'], filename, byte_size, checksum, video_url,
+                             resolved_time - start_time, end_time - resolved_time)
+    shard.complete(clip['id'])
+    print_download_summary(filename, byte_size, end_time - start_time)
+    verifier.submit(manifest, clip, filename, checksum)
+    if resource_filter is not None and resource_filter.pop_blocked_media(video_url):
+        console.print(f"🚫 In-page video stream was blocked, avoiding {byte_size / (1024 * 1024):.2f} MB on the clip page", style=DRACULA_COLORS['comment'])
+
+# Take the clip's lease, then check again that no other run finished the clip
+# between it being queued and the lease being taken
+def claim_clip(manifest, clip) -> bool:
+    if not shard.acquire(clip['id']):
+        console.print(f"Clip '{clip['title']}' is leased by another worker. Skipping download.", style=DRACULA_COLORS['yellow'])
+        return False
+    if manifest.is_downloaded(clip['id']) or shard.completed(clip['id']):
+        shard.release(clip['id'])
+        console.print(f"Clip '{clip['title']}' already exists. Skipping download.", style=DRACULA_COLORS['yellow'])
+        return False
+    return True
+
+# Clips downloaded before the manifest existed: a file already at the clip's
+# assigned path is hashed once and recorded as downloaded instead of fetched
+# again. Only clips the manifest has no history for are adopted, so a file
+# left by a failed run is downloaded again, and with --verify the adopted
+# file is checked like a fresh download.
+async def adopt_existing_file(manifest, clip, filename) -> bool:
+    if not manifest.is_new(clip['id']) or not os.path.isfile(filename):
+        return False
+    checksum = (await asyncio.to_thread(hash_file, filename)).hexdigest()
+    clip_store.adopt(filename, checksum)
+    manifest.mark_downloaded(clip['id'], filename, os.path.getsize(filename), checksum, None, None, None)
+    console.print(f"Clip '{clip['title']}' already exists as {filename}, recorded it in the manifest. Skipping download.", style=DRACULA_COLORS['yellow'])
+    verifier.submit(manifest, clip, filename, checksum)
+    return True
+
+async def download_clip(browser, session, clip, manifest, dashboard=None):
+    manifest.record_clips([clip])
+    if manifest.is_downloaded(clip['id']):
         console.print(f"Clip '{clip['title']}' already exists. Skipping download.", style=DRACULA_COLORS['yellow'])
         return
+    filename = manifest.assign_file_path(clip)
+    if await adopt_existing_file(manifest, clip, filename):
+        return
+    if not claim_clip(manifest, clip):
+        return
 
     console.print(f"Attempting to download clip: {clip['title']}", style=DRACULA_COLORS['cyan'])
     
     for attempt in range(MAX_RETRIES):
         try:
             start_time = time.time()
-            video_url = await get_video_url(page, clip['url'], proxies)
-            if not video_url:
-                raise Exception("Failed to get video URL")
-
-            async with session.get(video_url) as response:
-                response.raise_for_status()
-                total_size = int(response.headers.get('content-length', 0))
-
-                with Progress() as progress:
-                    download_task = progress.add_task("[cyan]Downloading...", total=total_size)
-                    async with aiofiles.open(filename, 'wb') as file:
-                        async for chunk in response.content.iter_chunked(1024):
-                            await file.write(chunk)
-                            progress.update(download_task, advance=len(chunk))
-
-            end_time = time.time()
-            download_time = end_time - start_time
-            file_size = os.path.getsize(filename)
-            
-            console.print(f"✅ Clip downloaded successfully: {filename}", style=DRACULA_COLORS['green'])
-            console.print(f"File size: {file_size / (1024 * 1024):.2f} MB", style=DRACULA_COLORS['yellow'])
-            console.print(f"Download time: {download_time:.2f} seconds", style=DRACULA_COLORS['yellow'])
+            video_url = signed_urls.get(clip['id'])
+            if video_url:
+                console.print("♻️ Reusing signed URL from the previous attempt", style=DRACULA_COLORS['cyan'])
+            else:
+                video_url = await browser.resolve_video_url(clip['url'])
+                if not video_url:
+                    raise Exception("Failed to get video URL")
+                signed_urls.put(clip['id'], video_url)
+            resolved_time = time.time()
+
+            result = await fetch_clip_file(session, video_url, clip_store.staging_path(clip['id']), dashboard, clip)
+
+            finish_download(manifest, clip, filename, video_url, result, start_time, resolved_time, browser.resource_filter)
             return
         except Exception as e:
+            signed_urls.reject(clip['id'], e)
             console.print(f"Attempt {attempt + 1} failed: {str(e)}", style=DRACULA_COLORS['red'])
             if attempt < MAX_RETRIES - 1:
                 console.print(f"Retrying in 5 seconds...", style=DRACULA_COLORS['yellow'])
                 await asyncio.sleep(5)
             else:
                 console.print(f"❌ Failed to download clip after {MAX_RETRIES} attempts", style=DRACULA_COLORS['red'])
+                manifest.mark_failed(clip['id'], str(e))
+                shard.release(clip['id'])
+
+# Scheduling order for downloads: most viewed first, then most recent
+def clip_priority(clip):
+    created_at = clip.get('created_at')
+    created = datetime.fromisoformat(created_at.replace('Z', '+00:00')).timestamp() if created_at else 0
+    return (-(clip.get('view_count') or 0), -created)
+
+# Pipelined download: a pool of browser pages resolves video URLs and feeds a
+# bounded queue that a separate pool of aiohttp tasks drains to disk. The queue
+# size caps how far URL resolution can run ahead of the downloads. Both queues
+# are ordered by clip_priority, so under limited bandwidth the most valuable
+# clips finish first; queue entries carry a sequence number as tie-breaker.
+# on_finished is called with the ID of every clip that leaves the pipeline,
+# whether downloaded, skipped or failed, after which it may be fed in again.
+async def run_download_pipeline(browser, session, clips, workers, manifest, on_finished=None):
+    resolve_queue = asyncio.PriorityQueue()
+    download_queue = asyncio.PriorityQueue(maxsize=workers * 2)
+    sequence = itertools.count()
+
+    done = asyncio.Event()
+    remaining = 0
+    producing = True
+    in_flight = set()
+    retry_tasks = set()
+
+    def leave(clip_id):
+        in_flight.discard(clip_id)
+        if on_finished is not None:
+            on_finished(clip_id)
+
+    def finish_one(clip_id):
+        nonlocal remaining
+        leave(clip_id)
+        remaining -= 1
+        if remaining == 0 and not producing:
+            done.set()
+
+    # Feed clips to the resolvers as they stream in from Helix
+    async def producer():
+        nonlocal remaining, producing
+        try:
+            async for clip in clips:
+                manifest.record_clips([clip])
+                if clip['id'] in in_flight:
+                    continue
+                if manifest.is_downloaded(clip['id']):
+                    console.print(f"Clip '{clip['title']}' already exists. Skipping download.", style=DRACULA_COLORS['yellow'])
+                    leave(clip['id'])
+                    continue
+                in_flight.add(clip['id'])
+                filename = manifest.assign_file_path(clip)
+                if await adopt_existing_file(manifest, clip, filename):
+                    leave(clip['id'])
+                    continue
+                remaining += 1
+                await resolve_queue.put((clip_priority(clip), next(sequence), clip, filename, 0))
+        finally:
+            producing = False
+            if remaining == 0:
+                done.set()
+
+    async def retry_or_fail(clip, filename, attempt, error):
+        console.print(f"Attempt {attempt + 1} failed for '{clip['title']}': {str(error)}", style=DRACULA_COLORS['red'])
+        if attempt < MAX_RETRIES - 1:
+            await asyncio.sleep(5)
+            await resolve_queue.put((clip_priority(clip), next(sequence), clip, filename, attempt + 1))
+        else:
+            console.print(f"❌ Failed to download clip '{clip['title']}' after {MAX_RETRIES} attempts", style=DRACULA_COLORS['red'])
+            try:
+                manifest.mark_failed(clip['id'], str(error))
+            finally:
+                shard.release(clip['id'])
+                finish_one(clip['id'])
+
+    def schedule_retry(clip, filename, attempt, error):
+        task = asyncio.create_task(retry_or_fail(clip, filename, attempt, error))
+        retry_tasks.add(task)
+        task.add_done_callback(retry_tasks.discard)
+
+    async def resolver():
+        page = None
+        try:
+            while True:
+                _, _, clip, filename, attempt = await resolve_queue.get()
+                # Leases are taken when work starts, not when the clip is queued
+                try:
+                    claimed = claim_clip(manifest, clip)
+                except Exception as e:
+                    # e.g. an unwritable lease directory or a locked manifest
+                    schedule_retry(clip, filename, attempt, e)
+                    continue
+                if not claimed:
+                    finish_one(clip['id'])
+                    continue
+                start_time = time.time()
+                try:
+                    # Retries reuse the URL from the failed attempt while it is still valid
+                    video_url = signed_urls.get(clip['id'])
+                    if video_url is None:
+                        # Pages (and the browser itself) are only opened once there is work
+                        if page is None:
+                            page = await browser.new_page()
+                        dashboard.resolving += 1
+                        try:
+                            video_url = await browser.resolve_video_url(clip['url'], page)
+                        finally:
+                            dashboard.resolving -= 1
+                        if not video_url:
+                            raise Exception("Failed to get video URL")
+                        signed_urls.put(clip['id'], video_url)
+                except Exception as e:
+                    schedule_retry(clip, filename, attempt, e)
+                    continue
+                await download_queue.put((clip_priority(clip), next(sequence), clip, filename, attempt, video_url, start_time, time.time()))
+        finally:
+            if page is not None:
+                await page.close()
 
-# Function to list top clips
-async def list_clips(limit, oauth_token, client_id, game=None, headless=True):
-    async with async_playwright() as p:
-        browser, context, user_agent, proxies, context_options, browser_version = await create_browser_context(p, headless)
-        await echo_network_info(user_agent, proxies, context_options, browser_version)
-        
-        games_to_process = [game] if game else games_list
-        for game in games_to_process:
-            console.print(f"\nFetching top {limit} clips for game '{game}'", style=f"bold {DRACULA_COLORS['cyan']}")
+    async def downloader():
+        while True:
+            _, _, clip, filename, attempt, video_url, start_time, resolved_time = await download_queue.get()
             try:
-                clips = await get_top_clips(game, oauth_token, client_id, limit=limit)
-                if clips:
-                    table = Table(title=f"Top {len(clips)} Clips for {game}", style=DRACULA_COLORS['purple'])
-                    table.add_column("Title", style=DRACULA_COLORS['green'])
-                    table.add_column("Broadcaster", style=DRACULA_COLORS['orange'])
-                    table.add_column("Creator", style=DRACULA_COLORS['yellow'])
-                    table.add_column("Views", style=DRACULA_COLORS['pink'], justify="right")
-                    table.add_column("URL", style=DRACULA_COLORS['cyan'])
-                    table.add_column("Language", style=DRACULA_COLORS['foreground'])
-                    table.add_column("Created At", style=DRACULA_COLORS['foreground'])
-                    table.add_column("Status", style=DRACULA_COLORS['purple'])
-
-                    for clip in clips:
-                        filename = f"{clip['title'].replace(' ', '_')}.mp4"
-                        status = "📥 Downloaded" if file_exists(filename) else "🆕 New"
-                        table.add_row(
-                            clip['title'],
-                            clip['broadcaster_name'],
-                            clip['creator_name'],
-                            str(clip['view_count']),
-                            clip['url'],
-                            clip['language'],
-                            clip['created_at'],
-                            status
-                        )
-
-                    console.print(table)
-                else:
-                    console.print(f"No clips found for '{game}'", style=DRACULA_COLORS['yellow'])
+                result = await fetch_clip_file(session, video_url, clip_store.staging_path(clip['id']), dashboard, clip)
             except Exception as e:
-                console.print(f"❌ Error fetching clips for '{game}': {str(e)}", style=f"bold {DRACULA_COLORS['red']}")
-        
-        await browser.close()
+                signed_urls.reject(clip['id'], e)
+                schedule_retry(clip, filename, attempt, e)
+                continue
+            try:
+                finish_download(manifest, clip, filename, video_url, result, start_time, resolved_time, browser.resource_filter)
+            except Exception as e:
+                # e.g. a full disk or a locked manifest; the retry downloads the clip again
+                schedule_retry(clip, filename, attempt, e)
+                continue
+            finish_one(clip['id'])
+
+    with DownloadDashboard() as dashboard:
+        dashboard.track_queues(resolve_queue, download_queue)
+        producer_task = asyncio.create_task(producer())
+        tasks = [asyncio.create_task(resolver()) for _ in range(workers)]
+        tasks += [asyncio.create_task(downloader()) for _ in range(workers)]
+        try:
+            # Workers only stop by crashing, so stop the run as soon as one does
+            # instead of waiting for clips it will never finish
+            tasks.append(asyncio.create_task(done.wait()))
+            finished, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                task.result()
+            # Surface errors from the clip source, e.g. a failed Helix request
+            await producer_task
+        finally:
+            tasks.append(producer_task)
+            tasks += list(retry_tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+CLIP_STATUS_LABELS = {
+    'downloaded': "📥 Downloaded",
+    'failed': "⚠️ Failed",
+}
 
-# Function to download latest clips
-async def download_latest_clips(limit, oauth_token, client_id, game=None, headless=True):
-    async with async_playwright() as p:
-        browser, context, user_agent, proxies, context_options, browser_version = await create_browser_context(p, headless)
-        await echo_network_info(user_agent, proxies, context_options, browser_version)
-        page = await context.new_page()
-        
+# Stream clips for several games at once. Each game pages through Helix in its
+# own task (all sharing the client's rate limiter) and clips are yielded in
+# arrival order. Closing the generator early cancels the remaining requests.
+def stream_games_clips(helix, games, limit, started_at=None, ended_at=None):
+    return stream_clip_windows(helix, [(game_name, started_at, ended_at) for game_name in games], limit)
+
+# Stream clips for (game, started_at, ended_at) windows concurrently. A window
+# listed to its end with fewer than `limit` clips is appended to `exhausted`
+# once all of its clips have been yielded.
+async def stream_clip_windows(helix, windows, limit, exhausted=None, report_empty=True):
+    queue = asyncio.Queue()
+
+    async def fetch_window(window):
+        game_name, started_at, ended_at = window
+        count = 0
+        complete = False
         try:
-            async with aiohttp.ClientSession() as session:
-                games_to_process = [game] if game else games_list
-                for game in games_to_process:
-                    console.print(f"\nFetching top {limit} clips for game '{game}'", style=f"bold {DRACULA_COLORS['cyan']}")
-                    clips = await get_top_clips(game, oauth_token, client_id, limit=limit)
-                    if clips:
-                        for clip in clips:
-                            await download_clip(page, session, clip, proxies)
-                    else:
-                        console.print(f"No clips found for '{game}'", style=DRACULA_COLORS['yellow'])
+            async for clip in helix.get_top_clips(game_name, limit=limit, started_at=started_at, ended_at=ended_at):
+                count += 1
+                queue.put_nowait(clip)
+            complete = count < limit
+            if not count and report_empty:
+                console.print(f"No clips found for '{game_name}'", style=DRACULA_COLORS['yellow'])
+        except Exception as e:
+            console.print(f"❌ Error fetching clips for '{game_name}': {str(e)}", style=f"bold {DRACULA_COLORS['red']}")
         finally:
-            await browser.close()
+            queue.put_nowait((window, complete))
+
+    tasks = [asyncio.create_task(fetch_window(window)) for window in windows]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if isinstance(item, tuple):
+                remaining -= 1
+                window, complete = item
+                if complete and exhausted is not None:
+                    exhausted.append(window)
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# Function to list top clips. This only talks to the Helix API, so no browser
+# is launched. All games are fetched concurrently and printed in list order.
+async def list_clips(limit, helix, manifest, game=None, started_at=None, ended_at=None):
+    games_to_process = [game] if game else games_list
+    for game in games_to_process:
+        console.print(f"\nFetching top {limit} clips for game '{game}'", style=f"bold {DRACULA_COLORS['cyan']}")
+
+    async def fetch_game(game_name):
+        return [clip async for clip in helix.get_top_clips(game_name, limit=limit, started_at=started_at, ended_at=ended_at)]
+
+    results = await asyncio.gather(*(fetch_game(game) for game in games_to_process), return_exceptions=True)
+    for game, clips in zip(games_to_process, results):
+        if isinstance(clips, Exception):
+            console.print(f"❌ Error fetching clips for '{game}': {str(clips)}", style=f"bold {DRACULA_COLORS['red']}")
+            continue
+
+        manifest.record_clips(clips)
+        statuses = manifest.get_statuses([clip['id'] for clip in clips])
+        if clips:
+            from rich.table import Table
+            table = Table(title=f"Top {len(clips)} Clips for {game}", style=DRACULA_COLORS['purple'])
+            table.add_column("Title", style=DRACULA_COLORS['green'])
+            table.add_column("Broadcaster", style=DRACULA_COLORS['orange'])
+            table.add_column("Creator", style=DRACULA_COLORS['yellow'])
+            table.add_column("Views", style=DRACULA_COLORS['pink'], justify="right")
+            table.add_column("URL", style=DRACULA_COLORS['cyan'])
+            table.add_column("Language", style=DRACULA_COLORS['foreground'])
+            table.add_column("Created At", style=DRACULA_COLORS['foreground'])
+            table.add_column("Status", style=DRACULA_COLORS['purple'])
+
+            for clip in clips:
+                status = CLIP_STATUS_LABELS.get(statuses.get(clip['id']), "🆕 New")
+                table.add_row(
+                    clip['title'],
+                    clip['broadcaster_name'],
+                    clip['creator_name'],
+                    str(clip['view_count']),
+                    clip['url'],
+                    clip['language'],
+                    clip['created_at'],
+                    status
+                )
+
+            console.print(table)
+        else:
+            console.print(f"No clips found for '{game}'", style=DRACULA_COLORS['yellow'])
+
+# Function to download latest clips
+async def download_latest_clips(limit, helix, manifest, browser, game=None, workers=1, started_at=None, ended_at=None):
+    games_to_process = [game] if game else games_list
+    for game_name in games_to_process:
+        console.print(f"\nFetching top {limit} clips for game '{game_name}'", style=f"bold {DRACULA_COLORS['cyan']}")
+    clips = shard.filter(stream_games_clips(helix, games_to_process, limit, started_at=started_at, ended_at=ended_at))
+
+    async with create_download_session() as session:
+        if workers > 1:
+            console.print(f"\nDownloading with {workers} workers", style=f"bold {DRACULA_COLORS['cyan']}")
+        await run_download_pipeline(browser, session, clips, workers, manifest)
 
 # Function to test download one clip
-async def test_download_one_clip(limit, oauth_token, client_id, game=None, headless=True):
-    async with async_playwright() as p:
-        browser, context, user_agent, proxies, context_options, browser_version = await create_browser_context(p, headless)
-        await echo_network_info(user_agent, proxies, context_options, browser_version)
-        page = await context.new_page()
-        
-        game = game or random.choice(games_list)
-        console.print(f"\nTesting download for game '{game}'", style=f"bold {DRACULA_COLORS['cyan']}")
+async def test_download_one_clip(limit, helix, manifest, browser, game=None, started_at=None, ended_at=None):
+    game = game or random.choice(games_list)
+    console.print(f"\nTesting download for game '{game}'", style=f"bold {DRACULA_COLORS['cyan']}")
 
-        try:
-            clips = await get_top_clips(game, oauth_token, client_id, limit=limit)
-            if clips:
-                clip = random.choice(clips)  # Randomly select one clip
-                clip_info = Tree("Clip Information", style=DRACULA_COLORS['purple'])
-                clip_info.add(f"Clip URL: {clip['url']}", style=DRACULA_COLORS['cyan'])
-                clip_info.add(f"Clip Title: {clip['title']}", style=DRACULA_COLORS['green'])
-                clip_info.add(f"Broadcaster: {clip['broadcaster_name']}", style=DRACULA_COLORS['orange'])
-                clip_info.add(f"Creator: {clip['creator_name']}", style=DRACULA_COLORS['yellow'])
-                clip_info.add(f"Created At: {clip['created_at']}", style=DRACULA_COLORS['pink'])
-                console.print(clip_info)
-                
-                async with aiohttp.ClientSession() as session:
-                    await download_clip(page, session, clip, proxies)
-            else:
-                console.print(f"❌ No clips found for '{game}'", style=f"bold {DRACULA_COLORS['red']}")
-        except Exception as e:
-            console.print(f"❌ Error: {str(e)}", style=f"bold {DRACULA_COLORS['red']}")
-        
-        await browser.close()
+    try:
+        clips = [clip async for clip in helix.get_top_clips(game, limit=limit, started_at=started_at, ended_at=ended_at)]
+        if clips:
+            clip = random.choice(clips)  # Randomly select one clip
+            from rich.tree import Tree
+            clip_info = Tree("Clip Information", style=DRACULA_COLORS['purple'])
+            clip_info.add(f"Clip URL: {clip['url']}", style=DRACULA_COLORS['cyan'])
+            clip_info.add(f"Clip Title: {clip['title']}", style=DRACULA_COLORS['green'])
+            clip_info.add(f"Broadcaster: {clip['broadcaster_name']}", style=DRACULA_COLORS['orange'])
+            clip_info.add(f"Creator: {clip['creator_name']}", style=DRACULA_COLORS['yellow'])
+            clip_info.add(f"Created At: {clip['created_at']}", style=DRACULA_COLORS['pink'])
+            console.print(clip_info)
+            
+            async with create_download_session() as session:
+                await download_clip(browser, session, clip, manifest)
+        else:
+            console.print(f"❌ No clips found for '{game}'", style=f"bold {DRACULA_COLORS['red']}")
+    except Exception as e:
+        console.print(f"❌ Error: {str(e)}", style=f"bold {DRACULA_COLORS['red']}")
 
 # Function to download a specific clip by title
-async def download_clip_by_title(title, oauth_token, client_id, game=None, headless=True):
-    async with async_playwright() as p:
-        browser, context, user_agent, proxies, context_options, browser_version = await create_browser_context(p, headless)
-        await echo_network_info(user_agent, proxies, context_options, browser_version)
-        page = await context.new_page()
-        
-        async with aiohttp.ClientSession() as session:
+def print_title_candidates(matches):
+    from rich.table import Table
+    table = Table(title="Closest titles", style=DRACULA_COLORS['purple'])
+    table.add_column("Score", style=DRACULA_COLORS['cyan'])
+    table.add_column("Title", style=DRACULA_COLORS['green'])
+    table.add_column("Game", style=DRACULA_COLORS['orange'])
+    table.add_column("Views", style=DRACULA_COLORS['yellow'])
+    table.add_column("Status", style=DRACULA_COLORS['comment'])
+    for score, clip, status in matches:
+        table.add_row(f"{score:.2f}", clip['title'], clip.get('game_name') or "", str(clip.get('view_count', '')), CLIP_STATUS_LABELS.get(status, ""))
+    console.print(table)
+
+# Function to download a specific clip by title. Titles are matched after
+# normalization against the manifest's index of every listing seen so far;
+# Helix is only asked for the parts of the search window that no earlier
+# search has listed completely.
+async def download_clip_by_title(title, helix, manifest, browser, game=None, started_at=None, ended_at=None):
+    async with create_download_session() as session:
+        matches = manifest.search_titles(title, game)
+        if not matches or matches[0][0] < 1.0:
+            ended_at = ended_at or datetime.now(timezone.utc)
+            started_at = started_at or ended_at - DEFAULT_CLIP_WINDOW
             games_to_search = [game] if game else games_list
-            for game in games_to_search:
-                console.print(f"\nSearching for clip '{title}' in game '{game}'", style=f"bold {DRACULA_COLORS['cyan']}")
-                clips = await get_top_clips(game, oauth_token, client_id, limit=100)  # Increase limit to search more clips
-                matching_clip = next((clip for clip in clips if clip['title'].lower() == title.lower()), None)
-                if matching_clip:
-                    await download_clip(page, session, matching_clip, proxies)
-                    break
-            else:
-                console.print(f"❌ Clip '{title}' not found in any game", style=f"bold {DRACULA_COLORS['red']}")
-        
-        await browser.close()
+            windows = [
+                (game_name, gap_start, gap_end)
+                for game_name in games_to_search
+                for gap_start, gap_end in window_gaps(started_at, ended_at, manifest.covered_windows(game_name))
+            ]
+            if windows:
+                console.print(f"\nSearching {len(windows)} unindexed window(s) across {len(games_to_search)} game(s) for '{title}'", style=f"bold {DRACULA_COLORS['cyan']}")
+                # All windows are searched concurrently; an exact match cancels the rest
+                title_key = normalize_title(title)
+                exhausted = []
+                clips = stream_clip_windows(helix, windows, TITLE_SEARCH_LIMIT, exhausted, report_empty=False)
+                seen_clips = []
+                async for clip in clips:
+                    seen_clips.append(clip)
+                    if normalize_title(clip['title']) == title_key and (not game or clip['game_name'] == game):
+                        break
+                await clips.aclose()
+                manifest.record_clips(seen_clips)
+                for window in exhausted:
+                    manifest.add_coverage(*window)
+                matches = manifest.search_titles(title, game)
+
+        # Only an exact match is downloaded; near misses such as 'Amazing play 1'
+        # for 'Amazing play 2' are listed for the user to pick from
+        if matches and matches[0][0] == 1.0:
+            clip = matches[0][1]
+            console.print(f"\nFound clip '{clip['title']}'", style=f"bold {DRACULA_COLORS['cyan']}")
+            await download_clip(browser, session, clip, manifest)
+        else:
+            console.print(f"❌ Clip '{title}' not found in any game", style=f"bold {DRACULA_COLORS['red']}")
+            if matches:
+                print_title_candidates(matches)
+                console.print("Run -dt again with one of these titles to download it.", style=DRACULA_COLORS['yellow'])
+
+# Poll one game for clips created since its high-water mark. Returns this
+# shard's clips that are not downloaded yet (new, only listed before, or
+# failed) and not already in `queued`, the IDs this process has queued and not
+# yet finished; they are added to it.
+async def poll_new_clips(helix, manifest, game_name, limit, queued):
+    high_water = manifest.get_high_water(game_name)
+    started_at = None
+    if high_water:
+        started_at = datetime.fromisoformat(high_water.replace('Z', '+00:00')) - WATCH_OVERLAP
+
+    clips = [clip async for clip in helix.get_top_clips(game_name, limit=limit, started_at=started_at)]
+    statuses = manifest.get_statuses([clip['id'] for clip in clips])
+    new_clips = [clip for clip in clips if statuses.get(clip['id']) != 'downloaded' and clip['id'] not in queued and shard.owns(clip['id'])]
+    queued.update(clip['id'] for clip in new_clips)
+    manifest.record_clips(clips)
+
+    newest = max((clip['created_at'] for clip in clips), default=None)
+    if newest and (high_water is None or newest > high_water):
+        manifest.set_high_water(game_name, newest)
+    return new_clips
+
+# Long-running watch mode: each game is polled on its own schedule and only
+# newly seen clips are fed into a download pipeline that runs for the whole process
+async def watch_clips(limit, helix, manifest, browser, game=None, workers=1, interval=WATCH_INTERVAL, metrics_port=None):
+    queue = asyncio.Queue()
+    queued = set()
+    games_to_watch = [game] if game else games_list
+
+    async def queued_clips():
+        while True:
+            yield await queue.get()
+
+    async def poll_game(game_name):
+        game_interval = WATCH_INTERVALS.get(game_name, interval)
+        # Stagger the first polls so games don't all hit Helix at once
+        await asyncio.sleep(random.uniform(0, min(game_interval, 10)))
+        while True:
+            try:
+                new_clips = await poll_new_clips(helix, manifest, game_name, limit, queued)
+                if new_clips:
+                    console.print(f"🆕 {len(new_clips)} new clips for '{game_name}'", style=f"bold {DRACULA_COLORS['green']}")
+                for clip in new_clips:
+                    queue.put_nowait(clip)
+            except Exception as e:
+                console.print(f"❌ Error polling '{game_name}': {str(e)}", style=f"bold {DRACULA_COLORS['red']}")
+            await asyncio.sleep(game_interval)
+
+    console.print(f"👀 Watching {len(games_to_watch)} game(s), polling every {interval} seconds", style=f"bold {DRACULA_COLORS['cyan']}")
+    metrics_runner = await start_metrics_server(metrics_port) if metrics_port else None
+    async with create_download_session() as session:
+        pollers = [asyncio.create_task(poll_game(game_name)) for game_name in games_to_watch]
+        try:
+            # Finished clips leave `queued`, so a failed or skipped clip is tried again when next polled
+            await run_download_pipeline(browser, session, queued_clips(), workers, manifest, on_finished=queued.discard)
+        finally:
+            for poller in pollers:
+                poller.cancel()
+            await asyncio.gather(*pollers, return_exceptions=True)
+            if metrics_runner is not None:
+                await metrics_runner.cleanup()
 
 # Function to list supported games
 def list_supported_games(): 
@@ -527,15 +2549,29 @@ def print_welcome_screen():
     console.print("\nAvailable Commands:", style=f"bold {DRACULA_COLORS['cyan']}")
     
     commands = [
+        ("--browser-daemon     ", "Run a long-lived browser server (port set with `--browser-daemon-port`, default 8790). Other runs use it via `--browser-daemon-url` or `POO7ER_BROWSER_DAEMON_URL` and skip the browser cold start."),
         ("-dl, --download-latest", "Download the latest top clips. Can be combined with `-g` to specify a game and `-l` to set a clip limit."),
-        ("-dt, --download-title ", "Download a specific clip by title. Requires the `-g` flag to specify the game the clip is from."),
+        ("-dt, --download-title ", "Download a specific clip by title. Titles are matched ignoring case, accents, punctuation and spacing; if none matches exactly, the closest titles are listed instead. Combine with `-g` to search a single game."),
         ("-g,  --game <game>    ", "Specify a game to filter clips for use with `-lc`, `-dl`, `-td`, or `-dt`. Must be combined with these commands."),
         ("-gs, --games-supported", "List all games supported by the tool without performing any downloads."),
         ("-h,  --help           ", "Show this help message and exit."),
         ("-l,  --limit <number> ", "Limit the number of clips for use with `-lc` (list clips), `-dl` (download latest clips), or `-td` (test download). Defaults to 5 if not provided."),
         ("-lc, --list-clips     ", "List the top clips for a specified game. Can be combined with `-g` and `-l` for filtering."),
+        ("-nb, --no-block       ", "Load every resource on clip pages. By default images, fonts, styles, trackers and the in-page video stream are blocked while the video URL is extracted."),
+        ("-nn, --no-network-info", "Skip the network information echoed when the browser starts. The browser is only launched when a clip actually has to be downloaded."),
         ("-sb, --show-browser   ", "Show the browser during the clip download process for troubleshooting purposes."),
-        ("-td, --test-download  ", "Test downloading a random clip from a specific game. Requires `-g` to specify the game and can use `-l` to limit the number of clips checked.")
+        ("-td, --test-download  ", "Test downloading a random clip from a specific game. Requires `-g` to specify the game and can use `-l` to limit the number of clips checked."),
+        ("--started-at <date>   ", "Only include clips created at or after this ISO 8601 date/time (UTC if no offset). Defaults to 4 weeks before `--ended-at`."),
+        ("--ended-at <date>     ", "Only include clips created before this ISO 8601 date/time. Defaults to now."),
+        ("--watch              ", "Keep running, poll each game for clips created since the last poll and download only new ones. Works with `-g`, `-l` (clips per poll) and `-w`."),
+        ("--watch-interval <s> ", "Seconds between polls of each game in `--watch` mode. Defaults to 300."),
+        ("--max-bandwidth <MB/s>", "Cap the total download rate of this process, shared by all transfers. `-dl` and `--watch` download the most viewed (then newest) queued clips first."),
+        ("--shards <n>         ", "Split `-dl`/`--watch` across n worker processes by a stable hash of the clip ID, each with its own browser and download pool. Clips are leased so none is fetched twice."),
+        ("--shard-index <i>    ", "Run only shard i of `--shards` (e.g. one per machine sharing `POO7ER_STORE_DIR`)."),
+        ("--verify             ", "Parse each downloaded MP4 (ftyp/moov/mdat) in a process pool. Truncated clips are marked failed, and duration, codecs and dimensions go to the manifest and a `.info.json` sidecar."),
+        ("--metrics-file <path>", "Append per-phase timing spans (token fetch, game lookup, clip listing, navigation, URL extraction, HTTP download, disk write) as JSON lines."),
+        ("--metrics-port <port>", "Serve per-phase totals in Prometheus text format at `/metrics` while `--watch` runs. With `--shards`, shard i uses port + i."),
+        ("-w,  --workers <n>    ", "Number of concurrent browser pages and downloads for `-dl` and `--watch`. Video URLs are resolved while earlier clips download. Defaults to 1.")
     ]
 
     for command, description in commands:
@@ -553,6 +2589,22 @@ async def main():
     parser.add_argument('-l', '--limit', type=int, help='Limit number of clips', default=5)
     parser.add_argument('-dt', '--download-title', help='Download a specific clip by title')
     parser.add_argument('-sb', '--show-browser', action='store_true', help='Show browser for troubleshooting')
+    parser.add_argument('--browser-daemon', action='store_true', help='Run a long-lived browser server for other runs to use')
+    parser.add_argument('--browser-daemon-port', type=int, default=BROWSER_DAEMON_PORT, help='Port for --browser-daemon')
+    parser.add_argument('--browser-daemon-url', default=BROWSER_DAEMON_URL, help='Resolve clip pages with the browser daemon at this URL')
+    parser.add_argument('-nb', '--no-block', action='store_true', help='Load every resource on clip pages instead of blocking unneeded ones')
+    parser.add_argument('-nn', '--no-network-info', action='store_true', help='Do not print network information when the browser starts')
+    parser.add_argument('--started-at', type=parse_cli_datetime, help='Only include clips created at or after this date')
+    parser.add_argument('--ended-at', type=parse_cli_datetime, help='Only include clips created before this date')
+    parser.add_argument('--watch', action='store_true', help='Keep running and download new clips as they appear')
+    parser.add_argument('--watch-interval', type=int, default=WATCH_INTERVAL, help='Seconds between polls of each game in --watch mode')
+    parser.add_argument('--max-bandwidth', type=float, default=MAX_BANDWIDTH, help='Cap total download bandwidth in MB/s (0 = unlimited)')
+    parser.add_argument('--shards', type=int, default=1, help='Split -dl/--watch across this many workers by clip ID')
+    parser.add_argument('--shard-index', type=int, help='Run only this shard (0-based); without it --shards starts all workers locally')
+    parser.add_argument('--verify', action='store_true', help='Check each downloaded MP4 and write a .info.json sidecar with its duration, codecs and dimensions')
+    parser.add_argument('--metrics-file', default=METRICS_FILE, help='Append per-phase timing spans to this JSON lines file')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on this port in --watch mode')
+    parser.add_argument('-w', '--workers', type=int, help='Concurrent URL resolvers and downloads for -dl', default=1)
 
     args = parser.parse_args()
 
@@ -560,42 +2612,100 @@ async def main():
         print_welcome_screen()
         return
 
+    if args.browser_daemon:
+        await run_browser_daemon(args.browser_daemon_port, headless=not args.show_browser, block_resources=not args.no_block)
+        return
+
     # Check if only -g or -l are used without appropriate accompanying switches
-    if (args.game is not None or args.limit != 5) and not (args.list_clips or args.download_latest or args.test_download or args.download_title or args.games_supported):
+    if (args.game is not None or args.limit != 5) and not (args.list_clips or args.download_latest or args.test_download or args.download_title or args.games_supported or args.watch):
         console.print("Error: -g (--game) and -l (--limit) should be used with -lc, -dl, -td, or -dt.", style=f"bold {DRACULA_COLORS['red']}")
         console.print("For example:", style=DRACULA_COLORS['yellow'])
         console.print("  python poo7er.py -lc -g Rust -l 10", style=DRACULA_COLORS['yellow'])
         console.print("  python poo7er.py -dl -g 'Counter-Strike' -l 5", style=DRACULA_COLORS['yellow'])
         console.print("  python poo7er.py -td -g Dota2", style=DRACULA_COLORS['yellow'])
         console.print("  python poo7er.py -dt 'Amazing play' -g Rust", style=DRACULA_COLORS['yellow'])
+        return 1
+
+    if args.workers < 1:
+        console.print("Error: -w (--workers) must be at least 1.", style=f"bold {DRACULA_COLORS['red']}")
+        return 1
+
+    if args.watch_interval < 1:
+        console.print("Error: --watch-interval must be at least 1 second.", style=f"bold {DRACULA_COLORS['red']}")
+        return 1
+
+    if args.shards < 1 or (args.shard_index is not None and not 0 <= args.shard_index < args.shards):
+        console.print("Error: --shards must be at least 1 and --shard-index between 0 and --shards - 1.", style=f"bold {DRACULA_COLORS['red']}")
+        return 1
+
+    if (args.shards > 1 or args.shard_index is not None) and not (args.download_latest or args.watch):
+        console.print("Error: --shards and --shard-index are only used with -dl or --watch.", style=f"bold {DRACULA_COLORS['red']}")
+        return 1
+
+    if args.metrics_port and not args.watch:
+        console.print("Error: --metrics-port is only used with --watch.", style=f"bold {DRACULA_COLORS['red']}")
+        return 1
+
+    if args.max_bandwidth < 0:
+        console.print("Error: --max-bandwidth cannot be negative.", style=f"bold {DRACULA_COLORS['red']}")
+        return 1
+
+    if args.shards > 1 and args.shard_index is None:
+        return await run_shard_supervisor(args.shards)
+    if args.shard_index is not None:
+        shard.configure(args.shards, args.shard_index)
+        # Each shard serves its metrics on its own port: --metrics-port + shard index
+        if args.metrics_port:
+            args.metrics_port += args.shard_index
+
+    if args.games_supported:
+        list_supported_games()
         return
 
+    if args.metrics_file:
+        metrics.open_jsonl(args.metrics_file)
+    bandwidth.set_rate(args.max_bandwidth * 1024 * 1024)
+    verifier.enabled = args.verify
+
     try:
-        oauth_token = await get_twitch_oauth_token(CLIENT_ID, CLIENT_SECRET)
-
-        if args.games_supported:
-            list_supported_games()
-        elif args.list_clips:
-            await list_clips(args.limit, oauth_token, CLIENT_ID, args.game, headless=not args.show_browser)
-        elif args.download_latest:
-            await download_latest_clips(args.limit, oauth_token, CLIENT_ID, args.game, headless=not args.show_browser)
-        elif args.test_download:
-            await test_download_one_clip(args.limit, oauth_token, CLIENT_ID, args.game, headless=not args.show_browser)
-        elif args.download_title:
-            await download_clip_by_title(args.download_title, oauth_token, CLIENT_ID, args.game, headless=not args.show_browser)
-        else:
-            parser.print_help()
+        browser = BrowserSession(headless=not args.show_browser, show_network_info=not args.no_network_info, block_resources=not args.no_block)
+        if args.browser_daemon_url:
+            browser = RemoteBrowserSession(args.browser_daemon_url, fallback=browser)
+        async with HelixClient(CLIENT_ID, CLIENT_SECRET) as helix, browser:
+            with ClipManifest() as manifest:
+                window = {'started_at': args.started_at, 'ended_at': args.ended_at}
+                if args.list_clips:
+                    await list_clips(args.limit, helix, manifest, args.game, **window)
+                elif args.download_latest:
+                    await download_latest_clips(args.limit, helix, manifest, browser, args.game, workers=args.workers, **window)
+                elif args.test_download:
+                    await test_download_one_clip(args.limit, helix, manifest, browser, args.game, **window)
+                elif args.watch:
+                    await watch_clips(args.limit, helix, manifest, browser, args.game, workers=args.workers, interval=args.watch_interval, metrics_port=args.metrics_port)
+                elif args.download_title:
+                    await download_clip_by_title(args.download_title, helix, manifest, browser, args.game, **window)
+                else:
+                    parser.print_help()
+                await verifier.drain()
     except ValueError as e:
         console.print(f"Error: {str(e)}", style=f"bold {DRACULA_COLORS['red']}")
         console.print("Please make sure you have set up your .env file with valid CLIENT_ID and CLIENT_SECRET.", style=DRACULA_COLORS['yellow'])
+        return 1
     except Exception as e:
         console.print(f"An unexpected error occurred: {str(e)}", style=f"bold {DRACULA_COLORS['red']}")
         console.print(f"Stack trace:", style=f"bold {DRACULA_COLORS['red']}")
         import traceback
         console.print(traceback.format_exc(), style=DRACULA_COLORS['red'])
+        # Non-zero so callers such as the shard supervisor see the failure
+        return 1
+    finally:
+        shard.release_all()
+        verifier.close()
+        metrics.close()
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    signal.signal(signal.SIGINT, signal_handler)
+    sys.exit(asyncio.run(main()))
 
 
 
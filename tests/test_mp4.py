@@ -0,0 +1,70 @@
+# Checks for parse_mp4 against small synthetic MP4s built box by box
+import struct
+
+import pytest
+
+import poo7er
+
+def box(box_type, payload):
+    return struct.pack('>I4s', 8 + len(payload), box_type.encode()) + payload
+
+def full_box(box_type, version, payload):
+    return box(box_type, bytes([version, 0, 0, 0]) + payload)
+
+def track(handler, codec, width=0, height=0, version=0):
+    # tkhd ends with 16.16 fixed-point width and height
+    times = b'\0' * (32 if version == 1 else 20)
+    tkhd = full_box('tkhd', version, times + b'\0' * 52 + struct.pack('>II', width << 16, height << 16))
+    hdlr = full_box('hdlr', 0, b'\0' * 4 + handler.encode() + b'\0' * 12 + b'name\0')
+    stsd = full_box('stsd', 0, struct.pack('>I', 1) + box(codec, b'\0' * 70))
+    mdia = box('mdia', full_box('mdhd', 0, b'\0' * 20) + hdlr + box('minf', box('stbl', stsd)))
+    return box('trak', tkhd + mdia)
+
+def build_mp4(version=0, with_moov=True):
+    ftyp = box('ftyp', b'isom' + b'\0\0\2\0' + b'isomiso2avc1mp41')
+    if version == 1:
+        mvhd = full_box('mvhd', 1, struct.pack('>QQIQ', 0, 0, 90000, 90000 * 12) + b'\0' * 80)
+    else:
+        mvhd = full_box('mvhd', 0, struct.pack('>IIII', 0, 0, 1000, 30500) + b'\0' * 80)
+    moov = box('moov', mvhd + track('vide', 'avc1', 1920, 1080, version) + track('soun', 'mp4a'))
+    mdat = box('mdat', b'\x55' * 4096)
+    return ftyp + (moov if with_moov else b'') + mdat
+
+def parse(tmp_path, data):
+    path = tmp_path / 'clip.mp4'
+    path.write_bytes(data)
+    return poo7er.parse_mp4(str(path))
+
+def test_valid_file(tmp_path):
+    info = parse(tmp_path, build_mp4())
+    assert info['valid'], info['error']
+    assert info['boxes'] == ['ftyp', 'moov', 'mdat']
+    assert info['major_brand'] == 'isom'
+    assert info['duration'] == 30.5
+    assert (info['video_codec'], info['width'], info['height'], info['audio_codec']) == ('avc1', 1920, 1080, 'mp4a')
+
+def test_version_1_mvhd(tmp_path):
+    info = parse(tmp_path, build_mp4(version=1))
+    assert info['valid'], info['error']
+    assert info['duration'] == 12.0
+    assert (info['width'], info['height']) == (1920, 1080)
+
+def test_truncated_mdat(tmp_path):
+    info = parse(tmp_path, build_mp4()[:-500])
+    assert not info['valid']
+    assert info['error'].startswith("truncated: 'mdat' box")
+
+def test_missing_moov(tmp_path):
+    info = parse(tmp_path, build_mp4(with_moov=False))
+    assert not info['valid']
+    assert info['error'] == 'missing moov box'
+
+def test_not_an_mp4(tmp_path):
+    info = parse(tmp_path, b'<html>denied</html>')
+    assert not info['valid']
+    assert info['error'] == 'not an MP4: no ftyp box at start of file'
+
+def test_iter_mp4_boxes_rejects_overrun():
+    data = box('free', b'\0' * 8)[:-4]
+    with pytest.raises(ValueError, match="malformed 'free' box"):
+        list(poo7er.iter_mp4_boxes(data, 0, len(data)))
@@ -0,0 +1,61 @@
+# Checks for ShardCoordinator leases, in particular taking over stale ones
+import os
+import time
+
+import poo7er
+
+def coordinator(tmp_path, index=0):
+    shard = poo7er.ShardCoordinator(str(tmp_path / 'leases'))
+    shard.configure(2, index)
+    return shard
+
+def age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+def test_lease_is_exclusive(tmp_path):
+    first, second = coordinator(tmp_path), coordinator(tmp_path)
+    second.owner = 'other:1'
+    assert first.acquire('clip')
+    assert not second.acquire('clip')
+    first.release('clip')
+    assert second.acquire('clip')
+
+def test_fresh_lease_is_not_taken_over(tmp_path):
+    shard = coordinator(tmp_path)
+    path = shard.lease_path('clip')
+    open(path, 'w').close()
+    assert not shard.take_over_stale(path)
+    assert os.path.exists(path)
+    assert not shard.acquire('clip')
+
+def test_stale_lease_is_taken_over(tmp_path):
+    shard = coordinator(tmp_path)
+    path = shard.lease_path('clip')
+    open(path, 'w').close()
+    age(path, poo7er.LEASE_TTL + 60)
+    assert shard.acquire('clip')
+    assert 'clip' in shard.held
+    assert time.time() - os.path.getmtime(path) < 60
+    assert [name for name in os.listdir(shard.lease_dir) if name.endswith('.stale')] == []
+
+def test_take_over_of_a_vanished_lease(tmp_path):
+    shard = coordinator(tmp_path)
+    assert shard.take_over_stale(shard.lease_path('missing'))
+
+def test_completed_clip_leaves_a_marker(tmp_path):
+    first, second = coordinator(tmp_path), coordinator(tmp_path)
+    assert first.acquire('clip')
+    first.complete('clip')
+    assert not os.path.exists(first.lease_path('clip'))
+    assert second.completed('clip')
+
+def test_done_markers_are_spread_over_subdirectories(tmp_path):
+    shard = coordinator(tmp_path)
+    assert shard.acquire('clip')
+    shard.complete('clip')
+    path = shard.done_path('clip')
+    assert os.path.exists(path)
+    assert os.path.relpath(path, shard.lease_dir).count(os.sep) == 3
+    shard.reopen('clip')
+    assert not shard.completed('clip')
@@ -0,0 +1,35 @@
+# Checks for window_gaps, which decides which parts of a -dt search window
+# still have to be listed from Helix
+from datetime import datetime, timedelta, timezone
+
+import poo7er
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+def at(hours):
+    return START + timedelta(hours=hours)
+
+def test_nothing_covered():
+    assert poo7er.window_gaps(at(0), at(10), []) == [(at(0), at(10))]
+
+def test_fully_covered():
+    assert poo7er.window_gaps(at(2), at(8), [(at(0), at(10))]) == []
+
+def test_gaps_around_and_between_covered_windows():
+    covered = [(at(2), at(4)), (at(6), at(7))]
+    assert poo7er.window_gaps(at(0), at(10), covered) == [(at(0), at(2)), (at(4), at(6)), (at(7), at(10))]
+
+def test_overlapping_covered_windows():
+    covered = [(at(1), at(5)), (at(3), at(6))]
+    assert poo7er.window_gaps(at(0), at(8), covered) == [(at(0), at(1)), (at(6), at(8))]
+
+def test_covered_windows_outside_the_request():
+    covered = [(at(-5), at(1)), (at(9), at(20))]
+    assert poo7er.window_gaps(at(0), at(10), covered) == [(at(1), at(9))]
+
+def test_manifest_round_trip(tmp_path):
+    with poo7er.ClipManifest(str(tmp_path / 'manifest.db')) as manifest:
+        manifest.add_coverage('Rust', at(0), at(4))
+        manifest.add_coverage('Dota 2', at(4), at(8))
+        assert manifest.covered_windows('Rust') == [(at(0), at(4))]
+        assert poo7er.window_gaps(at(0), at(8), manifest.covered_windows('Rust')) == [(at(4), at(8))]